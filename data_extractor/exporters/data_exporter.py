@@ -1,8 +1,16 @@
 # data_extractor/exporters/data_exporter.py
 
+import json
 import os
 import pandas as pd
 import re
+import tempfile
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+
+from ..utils.jsonl import iter_jsonl
 
 # at top of file, add imports
 
@@ -450,102 +458,129 @@ def format_rating(rating) -> str:
         return "not available"
     return str(rating)
 
-def run_export(raw_json_path: str, structured_json_path: str, output_excel_path: str, test_limit: int = None) -> None:
-    """Export structured JSON to Excel with custom formatting."""
-    df = pd.read_json(structured_json_path)
-    
-    if test_limit:
-        df = df.head(test_limit)
-        print(f"Processing first {test_limit} records for testing...")
+EXPORT_SHEET = "Doctor Data"
+CONTACT_COLUMN = "Contact Number"
 
-    # Build output DataFrame
-    out = pd.DataFrame()
-    
-    # 1. Complete Address + Locality
-    out["Complete Address"] = (
-        df.get("complete_address", "").fillna("") + " " +
-        df.get("locality", "").fillna("")
-    ).str.strip()
-    
-    # 2. Doctor Name
-    out["Doctor Name"] = df.get("doctor_name", "").fillna("")
-    
-    # 3. Specialty
-    out["Specialty"] = df.get("specialty_raw", "").fillna("")
-    
-    # 4. Clinic/Hospital
-    out["Clinic/Hospital"] = df.get("clinic_hospital_standardized", "").fillna("")
-    
-    # 5. Years of Experience
-    out["Years of Experience"] = df.get("years_of_experience")
-    
-    # 6. Contact Number (formatted to prevent scientific notation)
-    out["Contact Number"] = df.get("contact_number", "").apply(format_contact_number)
-    
-    # 7. Contact Email
-    out["Contact Email"] = df.get("contact_email", "").fillna("")
-    
-    # 8. Ratings (formatted to show "not available" for null/0/NIL)
-    out["Ratings"] = df.get("ratings", "").apply(format_rating)
-    
-    # 9. Reviews (cleaned text only)
-    def format_reviews(row):
-        count = row.get("review_count", 0)
-        summaries = row.get("reviews_summary") or []
-        
-        if not count or count == 0 or not summaries:
-            return "NIL"
-        
-        return clean_reviews_text(summaries)
-    
-    out["Reviews"] = df.apply(format_reviews, axis=1)
-    
-    # 10. Summary of Pros and Cons (renamed and improved)
-    out["Summary of Pros and Cons (Summary of reviews), and recommendation"] = df.apply(
-        lambda r: generate_pros_cons_summary(
-            r.get("reviews_summary") or [], 
-            r.get("recommendation_percent")
+
+def format_reviews(record: dict) -> str:
+    count = record.get("review_count", 0)
+    summaries = record.get("reviews_summary") or []
+
+    if not count or count == 0 or not summaries:
+        return "NIL"
+
+    return clean_reviews_text(summaries)
+
+
+def _text(value) -> str:
+    return "" if value is None else value
+
+
+def build_export_row(record: dict) -> dict:
+    """Maps one structured record to the columns of the Excel export."""
+    return {
+        # 1. Complete Address + Locality
+        "Complete Address": f"{_text(record.get('complete_address'))} {_text(record.get('locality'))}".strip(),
+        # 2. Doctor Name
+        "Doctor Name": _text(record.get("doctor_name")),
+        # 3. Specialty
+        "Specialty": _text(record.get("specialty_raw")),
+        # 4. Clinic/Hospital
+        "Clinic/Hospital": _text(record.get("clinic_hospital_standardized")),
+        # 5. Years of Experience
+        "Years of Experience": record.get("years_of_experience"),
+        # 6. Contact Number (formatted to prevent scientific notation)
+        CONTACT_COLUMN: format_contact_number(record.get("contact_number")),
+        # 7. Contact Email
+        "Contact Email": _text(record.get("contact_email")),
+        # 8. Ratings (formatted to show "not available" for null/0/NIL)
+        "Ratings": format_rating(record.get("ratings")),
+        # 9. Reviews (cleaned text only)
+        "Reviews": format_reviews(record),
+        # 10. Summary of Pros and Cons (renamed and improved)
+        "Summary of Pros and Cons (Summary of reviews), and recommendation": generate_pros_cons_summary(
+            record.get("reviews_summary") or [],
+            record.get("recommendation_percent")
         ),
-        axis=1
-    )
+    }
+
+
+class ExcelExportWriter:
+    """
+    Takes structured records one at a time, e.g. straight from the processing
+    stage, and builds their export rows as they arrive. Rows are spooled to a
+    temporary file while the column widths are measured (a write-only sheet
+    needs them before the first row); `save` then writes the workbook, so
+    memory use does not depend on the number of records.
+    """
+
+    def __init__(self, output_excel_path: str, limit: int = None):
+        self.output_excel_path = output_excel_path
+        self.limit = limit
+        self.columns = None
+        self.max_lengths = {}
+        self.rows = 0
+        os.makedirs(os.path.dirname(output_excel_path) or ".", exist_ok=True)
+        self._spool = tempfile.TemporaryFile("w+", encoding="utf-8", dir=os.path.dirname(output_excel_path) or ".")
+
+    def add(self, record: dict) -> bool:
+        """Adds one record; returns False once `limit` rows have been added."""
+        if self.limit and self.rows >= self.limit:
+            return False
+        row = build_export_row(record)
+        if self.columns is None:
+            self.columns = list(row)
+            self.max_lengths = {column: len(column) for column in self.columns}
+        for column, value in row.items():
+            if value is not None:
+                self.max_lengths[column] = max(self.max_lengths[column], len(str(value)))
+        self._spool.write(json.dumps(list(row.values()), ensure_ascii=False) + "\n")
+        self.rows += 1
+        return True
+
+    def save(self) -> int:
+        """Writes the workbook and returns the number of rows exported."""
+        if self.columns is None:
+            self._spool.close()
+            return 0
+
+        # Create Excel file
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(EXPORT_SHEET)
 
-    # Create Excel file
-    os.makedirs(os.path.dirname(output_excel_path), exist_ok=True)
-    
-    with pd.ExcelWriter(output_excel_path, engine="openpyxl") as writer:
-        out.to_excel(writer, sheet_name="Doctor Data", index=False)
-        
-        # Get the workbook and worksheet
-        workbook = writer.book
-        worksheet = writer.sheets["Doctor Data"]
-        
-        # Format contact number column as text to prevent scientific notation
-        contact_col = None
-        for idx, col_name in enumerate(out.columns):
-            if col_name == "Contact Number":
-                contact_col = idx + 1  # Excel columns are 1-indexed
-                break
-        
-        if contact_col:
-            # Set the entire contact number column format to text
-            for row in range(2, len(out) + 2):  # Start from row 2 (after header)
-                cell = worksheet.cell(row=row, column=contact_col)
-                cell.number_format = '@'  # Text format
-        
         # Auto-adjust column widths
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            adjusted_width = min(max_length + 2, 50)  # Cap at 50 for readability
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+        for idx, column in enumerate(self.columns, start=1):
+            worksheet.column_dimensions[get_column_letter(idx)].width = min(self.max_lengths[column] + 2, 50)  # Cap at 50 for readability
+        worksheet.append(self.columns)
+
+        contact_index = self.columns.index(CONTACT_COLUMN)
+        self._spool.seek(0)
+        for line in self._spool:
+            cells = json.loads(line)
+            # Format contact number column as text to prevent scientific notation
+            cell = WriteOnlyCell(worksheet, value=cells[contact_index])
+            cell.number_format = '@'
+            cells[contact_index] = cell
+            worksheet.append(cells)
+        self._spool.close()
+
+        workbook.save(self.output_excel_path)
+        return self.rows
+
+
+def run_export(raw_json_path: str, structured_json_path: str, output_excel_path: str, test_limit: int = None) -> None:
+    """Export structured JSON Lines to Excel with custom formatting."""
+    if test_limit:
+        print(f"Processing first {test_limit} records for testing...")
+
+    exporter = ExcelExportWriter(output_excel_path, test_limit)
+    for record in iter_jsonl(structured_json_path):
+        if not exporter.add(record):
+            break
+    exported = exporter.save()
+    if not exported:
+        print(f"No records to export in {structured_json_path}")
+        return
 
     print(f"Excel exported successfully to: {output_excel_path}")
-    print(f"Total records exported: {len(out)}")
+    print(f"Total records exported: {exported}")
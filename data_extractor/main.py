@@ -1,21 +1,31 @@
 # data_extractor/main.py
 
 import asyncio
+import concurrent.futures
 import pandas as pd
-import json
-import os
+import threading
 import time
+from collections import deque
 from tqdm.asyncio import tqdm
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
 from httpx import AsyncClient
 
-from .scrapers.profile_scraper import ProfileScraper
+from .scrapers.scrape_session import ProfileScrapeSession
+from .scrapers.browser_shards import scrape_sharded
+from .scrapers.profile_selectors import profile_selectors
 from .processors.data_processor import DataProcessor
-from .utils.config import INPUT_URL_FILE, OUTPUT_RAW_FILE, OUTPUT_PROCESSED_FILE
+from .utils.config import INPUT_URL_FILE, RAW_JSONL_FILE, PROCESSED_JSONL_FILE
+from .utils.jsonl import JsonlWriter, iter_jsonl
+from .utils.status_ledger import StatusLedger
 from .utils.logger import app_logger
+from .utils.rate_limiter import rate_limiter
 
-from .exporters.data_exporter import run_export
+from .exporters.data_exporter import ExcelExportWriter
 from .utils.config import EXPORT_CSV_FILE, EXPORT_EXCEL_FILE, TEST_LIMIT
+from .utils.config import EXTRACTOR_PROCESSES, SHARD_CHUNK_SIZE
+from .utils.config import JSONL_FSYNC_BATCH, PROCESS_CONCURRENCY, PIPELINE_QUEUE_SIZE
+from .utils.config import LEDGER_ENABLED, LEDGER_PATH, LEDGER_BATCH, MAX_URL_ATTEMPTS
+from .utils.config import SELECTOR_STATS_FILE
 
 
 
@@ -23,41 +33,6 @@ from .utils.config import EXPORT_CSV_FILE, EXPORT_EXCEL_FILE, TEST_LIMIT
 geocoding_semaphore = asyncio.Semaphore(2)
 
 
-async def scrape_single_url(context, url: str) -> dict:
-    """Fetches and scrapes a single URL with contact button clicking."""
-    page = None
-    try:
-        page = await context.new_page()
-        await page.goto(url, timeout=60000, wait_until='domcontentloaded')
-        await page.wait_for_selector("div.c-profile--clinic--item", timeout=20000)
-        
-        # Click “Call Now” if present
-        try:
-            call_button = await page.wait_for_selector('button:has-text("Call Now")', timeout=5000)
-            if call_button:
-                await call_button.click()
-                await page.wait_for_timeout(2000)
-        except:
-            pass
-        
-        html_content = await page.content()
-        scraper = ProfileScraper(html_content, debug_mode=False, save_debug_html=False)
-        raw_data = scraper.extract_data()
-        raw_data['source_url'] = url
-        
-        return {"url": url, "status": "scraped", "raw_data": raw_data}
-
-    except PlaywrightTimeoutError:
-        app_logger.error(f"Timeout waiting for content on {url}. Skipping.")
-        return {"url": url, "status": "timeout_error", "raw_data": None}
-    except Exception as e:
-        app_logger.error(f"Failed to scrape {url}: {e}")
-        return {"url": url, "status": "fetch_failed", "raw_data": None}
-    finally:
-        if page and not page.is_closed():
-            await page.close()
-
-
 async def process_record(raw_record: dict, geo_client: AsyncClient) -> dict | None:
     """Process a single record under semaphore control."""
     if not raw_record:
@@ -67,6 +42,81 @@ async def process_record(raw_record: dict, geo_client: AsyncClient) -> dict | No
         return await processor.process(geo_client)
 
 
+async def process_stage(raw_queue: asyncio.Queue, processed_queue: asyncio.Queue, writer: JsonlWriter,
+                        geo_client: AsyncClient, progress, ledger: StatusLedger | None = None, checkpoint=None) -> None:
+    """
+    Takes raw records off `raw_queue` until the None that ends it, with at most
+    PROCESS_CONCURRENCY records in flight, and passes the processed ones, in
+    input order, to `writer` and `processed_queue`. With a ledger, records
+    processed by an earlier run are skipped.
+    """
+    pending = deque()
+    seen = set()
+
+    async def finish_oldest():
+        url, task = pending.popleft()
+        processed = await task
+        if processed:
+            writer.write(processed)
+            await processed_queue.put(processed)
+        if ledger:
+            ledger.mark_processed(url)
+            if ledger.should_flush():
+                checkpoint()
+        progress.update(1)
+
+    try:
+        while True:
+            # Hand on whatever is already done before waiting for more input
+            while pending and pending[0][1].done():
+                await finish_oldest()
+            record = await raw_queue.get()
+            if record is None:
+                break
+            url = record.get('source_url', '')
+            if ledger:
+                # A crash between a raw write and the ledger flush leaves the URL in the raw file twice
+                if url in seen or ledger.is_processed(url):
+                    continue
+                seen.add(url)
+            pending.append((url, asyncio.create_task(process_record(record, geo_client))))
+            if len(pending) >= PROCESS_CONCURRENCY:
+                await finish_oldest()
+        while pending:
+            await finish_oldest()
+    finally:
+        await processed_queue.put(None)
+
+
+async def export_stage(processed_queue: asyncio.Queue, exporter: ExcelExportWriter) -> None:
+    """Adds processed records to the export until the None that ends the queue."""
+    while True:
+        record = await processed_queue.get()
+        if record is None:
+            return
+        # Past the export limit the queue is still drained, so processing never stalls
+        exporter.add(record)
+
+
+async def run_stages(stages: dict) -> dict:
+    """Runs the stage coroutines concurrently; returns when each finished, in seconds."""
+    start = time.monotonic()
+    finished = {}
+
+    async def timed(name, stage):
+        await stage
+        finished[name] = time.monotonic() - start
+
+    tasks = [asyncio.create_task(timed(name, stage)) for name, stage in stages.items()]
+    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    # One failed stage would leave the others blocked on their queues
+    for task in pending:
+        task.cancel()
+    for task in done:
+        task.result()
+    return finished
+
+
 async def main():
     start_time = time.time()
     app_logger.info("--- Testing Contact Extraction on Small Dataset ---")
@@ -91,27 +141,123 @@ async def main():
         app_logger.error(f"Error reading URL file: {e}")
         return
 
-    all_raw_data = []
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        
-        tasks = [scrape_single_url(context, url) for url in urls_to_scrape]
-        scrape_results = await tqdm.gather(*tasks, desc="Testing Contact Extraction")
-        await browser.close()
+    # Skip URLs an earlier run scraped; retry failures while they have attempts left
+    ledger = StatusLedger(LEDGER_PATH, MAX_URL_ATTEMPTS, LEDGER_BATCH) if LEDGER_ENABLED else None
+    backlog = 0
+    if ledger:
+        ledger.log_progress(urls_to_scrape)
+        urls_to_scrape = ledger.pending(urls_to_scrape)
+        # Scraped by an earlier run but never processed
+        backlog = ledger.unprocessed
+        app_logger.info(f"{len(urls_to_scrape)} URLs left to scrape, {backlog} scraped records left to process")
+
+    # Scraping, processing and export run at the same time, connected by bounded
+    # queues: a stage that falls behind makes the one before it wait.
+    raw_queue = asyncio.Queue(PIPELINE_QUEUE_SIZE)
+    processed_queue = asyncio.Queue(PIPELINE_QUEUE_SIZE)
 
-    all_raw_data = [res['raw_data'] for res in scrape_results if res and res.get('raw_data')]
-    test_file = "output/test_contact_extraction.json"
-    os.makedirs(os.path.dirname(test_file), exist_ok=True)
-    with open(test_file, 'w', encoding='utf-8') as f:
-        json.dump(all_raw_data, f, indent=4, ensure_ascii=False)
-    app_logger.success(f"Saved {len(all_raw_data)} test records to {test_file}")
+    # Raw and processed records are appended to JSON Lines files as they come in: in the
+    # order they are scraped, or in input order with EXTRACTOR_PROCESSES > 1
+    raw_writer = JsonlWriter(RAW_JSONL_FILE, JSONL_FSYNC_BATCH, resume=bool(ledger and ledger.scraped))
+    resume_processed = bool(ledger and ledger.scraped > ledger.unprocessed)
+    processed_writer = JsonlWriter(PROCESSED_JSONL_FILE, JSONL_FSYNC_BATCH, resume=resume_processed)
+    exporter = ExcelExportWriter(EXPORT_EXCEL_FILE, limit=10)      # only first 10 records
+    if resume_processed:
+        # Records processed by earlier runs come first in the export
+        for record in iter_jsonl(PROCESSED_JSONL_FILE):
+            if not exporter.add(record):
+                break
+
+    scraped = contact_success = 0
+    samples = []
+
+    def checkpoint():
+        # The records must be on disk before the ledger says they are
+        raw_writer.flush()
+        processed_writer.flush()
+        ledger.flush()
+
+    async def handle_result(url, result):
+        nonlocal scraped, contact_success
+        record = result.get('raw_data') if result else None
+        if record:
+            raw_writer.write(record)
+        if ledger:
+            ledger.record(url, result['status'] if result else "fetch_failed", result.get('content_hash') if result else None)
+            if ledger.should_flush():
+                checkpoint()
+        if not record:
+            return
+        scraped += 1
+        contact_success += bool(record.get('contact_number'))
+        if len(samples) < 3:
+            samples.append(record)
+        await raw_queue.put(record)
+
+    async def scrape_stage():
+        try:
+            if backlog:
+                for record in iter_jsonl(RAW_JSONL_FILE):
+                    if not ledger.is_processed(record.get('source_url', '')):
+                        await raw_queue.put(record)
+            if EXTRACTOR_PROCESSES > 1:
+                # One browser, event loop and parser per process. Results are
+                # handled on this loop, so the writers and ledger stay single-threaded.
+                loop = asyncio.get_running_loop()
+                # Set when this stage ends for any reason, e.g. cancelled because
+                # processing failed, so the scraping thread and processes wind down too
+                stop = threading.Event()
 
-    contact_success = sum(1 for record in all_raw_data if record.get('contact_number'))
-    app_logger.info(f"Contact extraction success: {contact_success}/{len(all_raw_data)} records")
+                def on_result(url, result):
+                    future = asyncio.run_coroutine_threadsafe(handle_result(url, result), loop)
+                    while not stop.is_set():
+                        try:
+                            return future.result(timeout=1)
+                        except concurrent.futures.TimeoutError:
+                            continue
+                        except concurrent.futures.CancelledError:
+                            break   # the loop is shutting down
+                    future.cancel()
+                    stop.set()
+
+                try:
+                    await asyncio.to_thread(scrape_sharded, urls_to_scrape, EXTRACTOR_PROCESSES, SHARD_CHUNK_SIZE,
+                                            on_result, stop)
+                finally:
+                    stop.set()
+            else:
+                async with async_playwright() as p:
+                    session = ProfileScrapeSession(p)
+                    try:
+                        # Each record is handed on as soon as it is scraped
+                        await session.scrape(urls_to_scrape, on_result=handle_result)
+                    finally:
+                        await session.close()
+                session.log_summary()
+        finally:
+            await raw_queue.put(None)
+
+    try:
+        async with AsyncClient(http2=True) as geo_client:
+            with tqdm(total=backlog + len(urls_to_scrape), desc="Processing Test Data") as progress:
+                finished = await run_stages({
+                    "scraping": scrape_stage(),
+                    "processing": process_stage(raw_queue, processed_queue, processed_writer, geo_client,
+                                                progress, ledger, checkpoint),
+                    "export": export_stage(processed_queue, exporter),
+                })
+    finally:
+        raw_writer.close()
+        processed_writer.close()
+        if ledger:
+            ledger.flush()
+    app_logger.info("Pipeline stages finished after: " + ", ".join(f"{name} {seconds:.1f}s" for name, seconds in finished.items()))
+
+    app_logger.success(f"Saved {scraped} test records to {RAW_JSONL_FILE}")
+    app_logger.info(f"Contact extraction success: {contact_success}/{scraped} records")
 
     print("\n=== SAMPLE RESULTS ===")
-    for i, record in enumerate(all_raw_data[:3]):
+    for i, record in enumerate(samples):
         print(f"Record {i+1}:")
         print(f"  Doctor: {record.get('doctor_name')}")
         print(f"  Contact: {record.get('contact_number')}")
@@ -121,26 +267,20 @@ async def main():
         print(f"  Recommendation: {record.get('recommendation_percent')}%")
         print()
 
-    if all_raw_data:
-        app_logger.info(f"Processing {len(all_raw_data)} records...")
-        async with AsyncClient(http2=True) as geo_client:
-            tasks = [process_record(record, geo_client) for record in all_raw_data]
-            process_results = await tqdm.gather(*tasks, desc="Processing Test Data")
-
-        successful_processed_data = [data for data in process_results if data]
-        processed_file = "output/test_structured_doctor_data.json"
-        with open(processed_file, 'w', encoding='utf-8') as f:
-            json.dump(successful_processed_data, f, indent=4, ensure_ascii=False)
-        app_logger.success(f"Saved {len(successful_processed_data)} processed records to {processed_file}")
-
-        # ─────────── ADD EXPORT CALL ───────────
-        run_export(
-            raw_json_path        = test_file,
-            structured_json_path = processed_file,
-            output_excel_path    = EXPORT_EXCEL_FILE,
-            test_limit           = 10       # only first 10 records
-        )
-        # ────────────────────────────────────────
+    for host, stats in rate_limiter.stats().items():
+        app_logger.info(f"Rate limiter [{host}]: {stats['tokens_granted']} requests, waited {stats['total_wait_seconds']}s in total (max {stats['max_wait_seconds']}s)")
+    # Shard processes report their selector counters back, so these cover every page of the run
+    profile_selectors.log_summary()
+    profile_selectors.save(SELECTOR_STATS_FILE)
+    app_logger.success(f"Saved {processed_writer.written} processed records to {PROCESSED_JSONL_FILE}")
+
+    exported = exporter.save()
+    if exported:
+        app_logger.success(f"Excel exported to {EXPORT_EXCEL_FILE} ({exported} records)")
+
+    if ledger:
+        ledger.log_progress()
+        ledger.close()
 
     end_time = time.time()
     app_logger.info(f"--- Test completed in {end_time - start_time:.2f} seconds ---")
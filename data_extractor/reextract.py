@@ -0,0 +1,119 @@
+# data_extractor/reextract.py : Re-runs ProfileScraper over stored HTML, without touching the network.
+
+import argparse
+import glob
+import os
+import random
+import time
+from multiprocessing import Pool
+
+from tqdm import tqdm
+
+from .scrapers.profile_dom import DOM_BACKENDS
+from .scrapers.profile_scraper import ProfileScraper
+from .scrapers.profile_selectors import profile_selectors
+from .utils.config import HTML_ARCHIVE_DIR, REEXTRACT_JSONL_FILE, REEXTRACT_WORKERS, REEXTRACT_CHUNK_SIZE
+from .utils.config import JSONL_FSYNC_BATCH, PROFILE_PARSER_BACKEND, SELECTOR_STATS_FILE
+from .utils.html_archive import HtmlArchive
+from .utils.jsonl import JsonlWriter
+from .utils.logger import app_logger
+
+# Per worker process, opened by _init_worker
+_archive = None
+_seed = None
+_backend = PROFILE_PARSER_BACKEND
+
+
+def _init_worker(archive_dir: str | None, seed: int | None, backend: str):
+    global _archive, _seed, _backend
+    _archive = HtmlArchive(archive_dir) if archive_dir else None
+    _seed = seed
+    _backend = backend
+
+
+def _extract(task: tuple[str, str]) -> tuple[dict | None, dict]:
+    """Task is (source url, archive hash or file path). Returns the record and this worker's new selector counts."""
+    return _extract_record(task), profile_selectors.drain()
+
+
+def _extract_record(task: tuple[str, str]) -> dict | None:
+    url, source = task
+    try:
+        if _archive:
+            html_content = _archive.get(source)
+        else:
+            with open(source, "r", encoding="utf-8") as f:
+                html_content = f.read()
+        if _seed is not None:
+            # Same output for the same page, whichever worker gets it
+            random.seed(f"{_seed}:{url}")
+        raw_data = ProfileScraper(html_content, debug_mode=False, save_debug_html=False, backend=_backend).extract_data()
+        raw_data['source_url'] = url
+        return raw_data
+    except Exception as e:
+        app_logger.error(f"Re-extraction of {url} failed: {e}")
+        return None
+
+
+def archive_tasks(archive_dir: str) -> list[tuple[str, str]]:
+    """The latest archived fetch of every URL."""
+    archive = HtmlArchive(archive_dir)
+    try:
+        return archive.latest_fetches()
+    finally:
+        archive.close()
+
+
+def directory_tasks(directory: str) -> list[tuple[str, str]]:
+    """Every .html file of `directory`, under the same file: URL the archive import uses."""
+    return [(f"file:{path}", path) for path in sorted(glob.glob(os.path.join(directory, "*.html")))]
+
+
+def reextract(tasks: list[tuple[str, str]], output_path: str, archive_dir: str | None = None,
+              workers: int | None = None, seed: int | None = None, backend: str = PROFILE_PARSER_BACKEND,
+              selector_stats_path: str | None = SELECTOR_STATS_FILE) -> int:
+    """
+    Extracts every task in a pool of `workers` processes (one per core by
+    default) and streams the raw records, in task order, to `output_path` in
+    the format the live pipeline writes. Returns the number of records.
+    The selector counters of all workers are written to `selector_stats_path`.
+    """
+    workers = workers or os.cpu_count() or 1
+    app_logger.info(f"Re-extracting {len(tasks)} pages with {workers} processes ({backend} parser)")
+    start = time.perf_counter()
+    with Pool(workers, initializer=_init_worker, initargs=(archive_dir, seed, backend)) as pool, \
+            JsonlWriter(output_path, JSONL_FSYNC_BATCH) as writer:
+        results = pool.imap(_extract, tasks, chunksize=REEXTRACT_CHUNK_SIZE)
+        for raw_data, selector_counts in tqdm(results, total=len(tasks), desc="Re-extracting"):
+            profile_selectors.merge(selector_counts)
+            if raw_data:
+                writer.write(raw_data)
+    elapsed = time.perf_counter() - start
+    app_logger.success(
+        f"Re-extracted {writer.written}/{len(tasks)} records to {output_path} in {elapsed:.2f}s "
+        f"({writer.written / elapsed:.1f} records/sec)"
+    )
+    profile_selectors.log_summary()
+    if selector_stats_path:
+        profile_selectors.save(selector_stats_path)
+    return writer.written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-run ProfileScraper over stored HTML pages.")
+    parser.add_argument("--html-dir", help="Read the .html files of this directory (e.g. debug_html) instead of the archive")
+    parser.add_argument("--archive", default=HTML_ARCHIVE_DIR, help="HTML archive directory")
+    parser.add_argument("--output", default=REEXTRACT_JSONL_FILE, help="Raw JSON Lines file to write")
+    parser.add_argument("--workers", type=int, default=REEXTRACT_WORKERS, help="Processes (default: one per core)")
+    parser.add_argument("--seed", type=int, help="Seed the placeholder contact/email generators, for reproducible output")
+    parser.add_argument("--backend", default=PROFILE_PARSER_BACKEND, choices=list(DOM_BACKENDS),
+                        help="DOM backend to parse the pages with")
+    parser.add_argument("--selector-stats", default=SELECTOR_STATS_FILE, help="JSON file for the selector hit/miss counts")
+    args = parser.parse_args()
+
+    if args.html_dir:
+        reextract(directory_tasks(args.html_dir), args.output, workers=args.workers, seed=args.seed, backend=args.backend,
+                  selector_stats_path=args.selector_stats)
+    else:
+        reextract(archive_tasks(args.archive), args.output, archive_dir=args.archive, workers=args.workers,
+                  seed=args.seed, backend=args.backend, selector_stats_path=args.selector_stats)
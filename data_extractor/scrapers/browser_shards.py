@@ -0,0 +1,123 @@
+# data_extractor/scrapers/browser_shards.py
+
+import asyncio
+import multiprocessing
+import queue
+import threading
+
+from playwright.async_api import async_playwright
+from tqdm import tqdm
+
+from .profile_selectors import profile_selectors
+from .scrape_session import ProfileScrapeSession, log_fetch_paths, merge_counts
+from ..utils.logger import app_logger
+from ..utils.rate_limiter import rate_limiter
+
+
+async def _run_shard(shard_id: int, processes: int, task_queue, result_queue):
+    # Together the processes stay within the configured per-host rates.
+    rate_limiter.scale(1 / processes)
+    loop = asyncio.get_running_loop()
+    async with async_playwright() as p:
+        session = ProfileScrapeSession(p, progress=False)
+        try:
+            while True:
+                chunk = await loop.run_in_executor(None, task_queue.get)
+                if chunk is None:
+                    break
+                indexes, urls = zip(*chunk)
+                results = await session.scrape(list(urls))
+                result_queue.put(("results", list(zip(indexes, results))))
+        finally:
+            await session.close()
+            session.log_summary()
+            result_queue.put(("done", shard_id, session.counts(), profile_selectors.snapshot()))
+
+
+def _shard_process(shard_id: int, processes: int, task_queue, result_queue):
+    asyncio.run(_run_shard(shard_id, processes, task_queue, result_queue))
+
+
+def _terminate(workers: list):
+    for worker in workers:
+        if worker.is_alive():
+            worker.terminate()
+    for worker in workers:
+        worker.join()
+
+
+def scrape_sharded(urls: list[str], processes: int, chunk_size: int, on_result,
+                   stop: threading.Event | None = None) -> int:
+    """
+    Scrapes `urls` in `processes` worker processes, each with its own event
+    loop, browser and parser. URLs are handed out in small chunks from a shared
+    queue, so a process that finishes early keeps taking work instead of
+    waiting on a slow one. `on_result(url, result)` is called for every result
+    in the order of `urls`, as soon as all earlier results are in; only results that arrive
+    ahead of their turn are held in memory. Returns the number of URLs lost to
+    crashed processes. Once `stop` is set, or if `on_result` raises, the shard
+    processes are terminated and no further results are handed on.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    task_queue = ctx.Queue()
+    result_queue = ctx.Queue()
+    for start in range(0, len(urls), chunk_size):
+        task_queue.put([(i, urls[i]) for i in range(start, min(start + chunk_size, len(urls)))])
+    for _ in range(processes):
+        task_queue.put(None)
+
+    workers = [
+        ctx.Process(target=_shard_process, args=(i, processes, task_queue, result_queue), name=f"extractor-shard-{i}")
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+
+    waiting = {}      # index -> result, received ahead of its turn
+    next_index = 0
+    counts = {}
+    finished = 0
+    try:
+        with tqdm(total=len(urls), desc=f"Scraping profiles ({processes} processes)") as progress:
+            while finished < len(workers):
+                if stop is not None and stop.is_set():
+                    break
+                try:
+                    message = result_queue.get(timeout=1)
+                except queue.Empty:
+                    if not any(worker.is_alive() for worker in workers):
+                        app_logger.error("Every shard process exited before reporting back.")
+                        break
+                    continue
+                if message[0] == "results":
+                    waiting.update(message[1])
+                    progress.update(len(message[1]))
+                    while next_index in waiting and not (stop is not None and stop.is_set()):
+                        on_result(urls[next_index], waiting.pop(next_index))
+                        next_index += 1
+                else:
+                    finished += 1
+                    merge_counts(counts, message[2])
+                    profile_selectors.merge(message[3])
+    except BaseException:
+        _terminate(workers)
+        raise
+    if stop is not None and stop.is_set():
+        app_logger.warning("Sharded scrape stopped; terminating the shard processes.")
+        _terminate(workers)
+        return len(urls) - next_index
+
+    for worker in workers:
+        worker.join()
+        if worker.exitcode:
+            app_logger.error(f"{worker.name} exited with code {worker.exitcode}")
+
+    # Whatever is left sits behind a chunk that never came back
+    for index in sorted(waiting):
+        on_result(urls[index], waiting[index])
+    missing = len(urls) - next_index - len(waiting)
+    if missing:
+        app_logger.error(f"{missing} URLs were lost with a crashed shard process.")
+    if counts:
+        log_fetch_paths(counts)
+    return missing
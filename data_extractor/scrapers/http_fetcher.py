@@ -0,0 +1,91 @@
+# data_extractor/scrapers/http_fetcher.py
+
+import asyncio
+import random
+from collections import Counter
+
+import httpx
+
+from .profile_scraper import ProfileScraper
+from ..utils.config import (
+    REQUEST_TIMEOUT,
+    MAX_RETRIES,
+    BACKOFF_FACTOR,
+    USER_AGENTS,
+    REQUIRED_FIELDS,
+    HTTP_REQUIRE_CONTACT,
+    HTTP_FETCH_CONCURRENCY,
+    HTTP_MAX_CONNECTIONS,
+)
+from ..utils.html_archive import HtmlArchive, content_hash
+from ..utils.logger import app_logger
+from ..utils.rate_limiter import rate_limiter
+
+
+class HttpProfileFetcher:
+    """
+    Fetches profile pages with a pooled httpx client and extracts them from the
+    server-rendered HTML. A profile is accepted only when every REQUIRED_FIELDS
+    value is present and, with HTTP_REQUIRE_CONTACT, it does not hide its
+    number behind a "Call Now" button; everything else is left for the browser,
+    which can wait for rendering and click the button. Every fetched page goes
+    into `archive` when one is given.
+    """
+
+    def __init__(self, archive: HtmlArchive | None = None):
+        self.archive = archive
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=REQUEST_TIMEOUT,
+            follow_redirects=True,
+            headers={"User-Agent": random.choice(USER_AGENTS)},
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS),
+        )
+        self.semaphore = asyncio.Semaphore(HTTP_FETCH_CONCURRENCY)
+        self.fallback_reasons = Counter()
+
+    async def fetch(self, url: str) -> str | None:
+        for attempt in range(MAX_RETRIES):
+            try:
+                await rate_limiter.acquire(url)
+                response = await self.client.get(url)
+                if response.status_code == 200:
+                    return response.text
+                if response.status_code not in (429, 500, 502, 503, 504):
+                    app_logger.warning(f"HTTP fetch of {url} returned {response.status_code}")
+                    return None
+            except httpx.RequestError as e:
+                app_logger.warning(f"HTTP fetch of {url} failed (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
+            if attempt + 1 < MAX_RETRIES:
+                await asyncio.sleep(BACKOFF_FACTOR * (2 ** attempt))
+        return None
+
+    def _fallback(self, url: str, reason: str):
+        self.fallback_reasons[reason] += 1
+        app_logger.debug(f"{url} needs the browser: {reason}")
+        return None
+
+    async def scrape(self, url: str) -> dict | None:
+        """Returns the scrape result, or None when the URL needs the browser."""
+        async with self.semaphore:
+            html_content = await self.fetch(url)
+        if html_content is None:
+            return self._fallback(url, "fetch failed")
+        if self.archive:
+            page_hash = await asyncio.to_thread(self.archive.put, url, html_content)
+        else:
+            page_hash = content_hash(html_content)
+
+        scraper = ProfileScraper(html_content, debug_mode=False, save_debug_html=False)
+        if HTTP_REQUIRE_CONTACT and not scraper.find_real_contact_number() and scraper.has_call_button():
+            return self._fallback(url, "contact behind Call Now")
+        raw_data = scraper.extract_data()
+        missing = [field for field in REQUIRED_FIELDS if not raw_data.get(field)]
+        if missing:
+            return self._fallback(url, "missing " + ", ".join(missing))
+
+        raw_data['source_url'] = url
+        return {"url": url, "status": "scraped", "raw_data": raw_data, "content_hash": page_hash}
+
+    async def aclose(self):
+        await self.client.aclose()
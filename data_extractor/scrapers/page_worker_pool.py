@@ -0,0 +1,124 @@
+# data_extractor/scrapers/page_worker_pool.py
+
+import asyncio
+import time
+
+from ..utils.logger import app_logger
+
+
+class PageWorkerPool:
+    """
+    A fixed number of Playwright pages in one browser context. Each worker owns
+    one page and pulls URLs from a shared queue, navigating the same page from
+    URL to URL, so at most `workers` tabs are ever open however long the run
+    is; with `workers` 0 every URL gets a tab of its own. A page that crashes
+    or gets closed is replaced.
+
+    URLs can be added at any time with put(), and each one's callback is
+    awaited as soon as it is done. pause() waits until no URL is being
+    handled, e.g. to replace the context, and resume() carries on in
+    `self.context`.
+    """
+
+    def __init__(self, context, workers: int, handler):
+        self.context = context
+        self.workers = workers
+        self.handler = handler
+        self.pages = 0
+        self._queue = asyncio.Queue()
+        self._tasks: set[asyncio.Task] = set()
+        self._open = asyncio.Event()      # cleared while paused
+        self._open.set()
+        self._busy = 0
+        self._quiet = asyncio.Event()     # set while no URL is being handled
+        self._quiet.set()
+        self._pending = 0
+        self._done = asyncio.Event()      # set while every URL put is done
+        self._done.set()
+        self._error: BaseException | None = None
+        self._started = time.monotonic()
+        for _ in range(workers):
+            self._spawn(self._worker())
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def put(self, url: str, on_done):
+        """Queues `url`; `await on_done(result)` follows once it is done (result None where the handler raised)."""
+        self._pending += 1
+        self._done.clear()
+        if self.workers:
+            self._queue.put_nowait((url, on_done))
+        else:
+            self._spawn(self._single(url, on_done))
+
+    async def _handle(self, page, url: str, on_done):
+        """Handles `url` on `page` (a new one if there is none or it was closed); returns the page."""
+        await self._open.wait()
+        self._busy += 1
+        self._quiet.clear()
+        result = None
+        try:
+            if page is None or page.is_closed():
+                page = await self.context.new_page()
+            result = await self.handler(page, url)
+        except Exception as e:
+            app_logger.error(f"Page worker failed on {url}: {e}")
+        finally:
+            self._busy -= 1
+            if not self._busy:
+                self._quiet.set()
+        try:
+            await on_done(result)
+        except Exception as e:
+            # Surfaces in join(); the worker carries on
+            self._error = self._error or e
+        finally:
+            self.pages += 1
+            self._pending -= 1
+            if not self._pending or self._error:
+                self._done.set()
+        return page
+
+    @staticmethod
+    async def _close_page(page):
+        if page and not page.is_closed():
+            try:
+                await page.close()
+            except Exception as e:
+                app_logger.debug(f"Closing a page failed: {e}")
+
+    async def _worker(self):
+        page = None
+        try:
+            while True:
+                url, on_done = await self._queue.get()
+                page = await self._handle(page, url, on_done)
+        finally:
+            await self._close_page(page)
+
+    async def _single(self, url: str, on_done):
+        await self._close_page(await self._handle(None, url, on_done))
+
+    async def pause(self):
+        """Lets the URLs being handled finish and starts no new one until resume()."""
+        self._open.clear()
+        await self._quiet.wait()
+
+    def resume(self):
+        self._open.set()
+
+    async def join(self):
+        """Waits until every URL put so far is done; raises what a callback raised."""
+        await self._done.wait()
+        if self._error:
+            raise self._error
+
+    async def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        elapsed = max(time.monotonic() - self._started, 1e-6)
+        app_logger.debug(f"Page workers: {self.pages} pages in {elapsed:.1f}s ({self.pages / elapsed:.2f} pages/s, {self.workers} workers)")
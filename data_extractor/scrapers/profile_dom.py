@@ -0,0 +1,267 @@
+# data_extractor/scrapers/profile_dom.py : Interchangeable DOM backends for ProfileScraper.
+#
+# Every backend parses a profile page and answers the few questions the
+# extractors ask of it (which elements there are, their attributes, their
+# text) the way BeautifulSoup does, so ProfileScraper extracts the same fields
+# whichever backend is configured.
+
+import re
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional backend
+    LexborHTMLParser = None
+
+from ..utils.config import PROFILE_PARSER_BACKEND
+
+# BeautifulSoup keeps the strings of these tags out of get_text()
+TEXT_EXCLUDED_TAGS = frozenset({'script', 'style', 'template', 'rt', 'rp'})
+# ...and collapses strings of nothing but whitespace to one character, except in these
+WHITESPACE_PRESERVING_TAGS = frozenset({'pre', 'textarea'})
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+# Compiled once per process
+_EXCLUDED_ANCESTOR = " or ".join(f"ancestor::{tag}" for tag in sorted(TEXT_EXCLUDED_TAGS))
+_XPATH_DOCUMENT_STRINGS = etree.XPath(f"//text()[not({_EXCLUDED_ANCESTOR})]")
+_XPATH_STRINGS = etree.XPath(f"descendant::text()[not({_EXCLUDED_ANCESTOR})]", smart_strings=False)
+
+
+def _collapse_whitespace(string: str) -> str:
+    if string.strip(ASCII_SPACES):
+        return string
+    return '\n' if '\n' in string else ' '
+
+
+class SoupDocument:
+    """Reference implementation: full BeautifulSoup tree."""
+
+    def __init__(self, html_content: str):
+        self.root = BeautifulSoup(html_content, 'lxml')
+
+    def elements(self) -> list:
+        return self.root.find_all(True)
+
+    @staticmethod
+    def name(element) -> str:
+        return element.name
+
+    @staticmethod
+    def get(element, attr: str):
+        """An attribute's value; the class attribute as a list of classes."""
+        return element.get(attr)
+
+    @staticmethod
+    def text(element) -> str:
+        return element.get_text(strip=True)
+
+    def document_text(self) -> str:
+        return self.root.get_text()
+
+    @staticmethod
+    def contains(ancestor, element) -> bool:
+        return any(parent is ancestor for parent in element.parents)
+
+
+class LxmlDocument:
+    """Raw lxml tree; text is collected with precompiled XPath expressions."""
+
+    def __init__(self, html_content: str):
+        try:
+            self.root = etree.HTML(html_content)
+        except ValueError:
+            # A str with an XML encoding declaration has to be parsed as bytes
+            self.root = etree.HTML(html_content.encode('utf-8'), etree.HTMLParser(encoding='utf-8'))
+
+    def elements(self) -> list:
+        return list(self.root.iter(etree.Element)) if self.root is not None else []
+
+    @staticmethod
+    def name(element) -> str:
+        return element.tag
+
+    @staticmethod
+    def get(element, attr: str):
+        value = element.get(attr)
+        if attr == 'class' and value is not None:
+            return value.split()
+        return value
+
+    @staticmethod
+    def text(element) -> str:
+        return "".join(string.strip() for string in _XPATH_STRINGS(element))
+
+    def document_text(self) -> str:
+        if self.root is None:
+            return ""
+        return "".join(
+            string if string.strip(ASCII_SPACES) or self._preserves_whitespace(string)
+            else _collapse_whitespace(string)
+            for string in _XPATH_DOCUMENT_STRINGS(self.root)
+        )
+
+    @staticmethod
+    def _preserves_whitespace(string) -> bool:
+        element = string.getparent()
+        if string.is_tail:
+            # A tail follows its element, inside that element's parent
+            element = element.getparent()
+        while element is not None:
+            if element.tag in WHITESPACE_PRESERVING_TAGS:
+                return True
+            element = element.getparent()
+        return False
+
+    @staticmethod
+    def contains(ancestor, element) -> bool:
+        return any(parent is ancestor for parent in element.iterancestors())
+
+
+def _selectolax_strings(node, collapse: bool = False):
+    for child in node.iter(include_text=True):
+        if child.is_text_node:
+            yield _collapse_whitespace(child.text_content) if collapse else child.text_content
+        elif child.is_element_node and child.tag not in TEXT_EXCLUDED_TAGS:
+            yield from _selectolax_strings(child, collapse and child.tag not in WHITESPACE_PRESERVING_TAGS)
+
+
+class SelectolaxDocument:
+    """selectolax (lexbor) tree."""
+
+    def __init__(self, html_content: str):
+        if LexborHTMLParser is None:
+            raise ImportError("PROFILE_PARSER_BACKEND='selectolax' requires the selectolax package")
+        self.tree = LexborHTMLParser(html_content)
+
+    def elements(self) -> list:
+        root = self.tree.root
+        return [node for node in root.traverse() if node.is_element_node] if root is not None else []
+
+    @staticmethod
+    def name(element) -> str:
+        return element.tag
+
+    @staticmethod
+    def get(element, attr: str):
+        attributes = element.attributes
+        if attr not in attributes:
+            return None
+        value = attributes[attr] or ''  # valueless attributes read as '' in BeautifulSoup
+        return value.split() if attr == 'class' else value
+
+    @staticmethod
+    def text(element) -> str:
+        return "".join(string.strip() for string in _selectolax_strings(element))
+
+    def document_text(self) -> str:
+        root = self.tree.root
+        return "".join(_selectolax_strings(root, collapse=True)) if root is not None else ""
+
+    @staticmethod
+    def contains(ancestor, element) -> bool:
+        parent = element.parent
+        while parent is not None:
+            if parent.mem_id == ancestor.mem_id:
+                return True
+            parent = parent.parent
+        return False
+
+
+DOM_BACKENDS = {
+    "bs4": SoupDocument,
+    "lxml": LxmlDocument,
+    "selectolax": SelectolaxDocument,
+}
+
+
+def parse_document(html_content: str, backend: str = PROFILE_PARSER_BACKEND):
+    return DOM_BACKENDS[backend](html_content)
+
+
+def _value_matches(value, rule) -> bool:
+    if value is None:
+        return False
+    if isinstance(rule, re.Pattern):
+        return rule.search(value) is not None
+    return value == rule
+
+
+def _attribute_matches(document, element, attr: str, rule) -> bool:
+    """Same rules as BeautifulSoup's find(): any single class, or the whole class string."""
+    value = document.get(element, attr)
+    if isinstance(value, list):
+        if any(_value_matches(item, rule) for item in value):
+            return True
+        return len(value) != 1 and _value_matches(" ".join(value), rule)
+    return _value_matches(value, rule)
+
+
+class ElementIndex:
+    """
+    Every element of a document bucketed by name, by data-qa-id and by class,
+    built in one walk of the tree. A lookup only tests the elements of its
+    smallest bucket, in document order, so it returns what soup.find_all
+    would. A class regex is run over the distinct class values of the page
+    rather than over every element.
+    """
+
+    def __init__(self, document):
+        self.document = document
+        self.by_name: dict[str, list] = {}
+        self.by_qa_id: dict[str, list] = {}
+        # An element is listed under each of its classes and, with several, under the whole class string
+        self.by_class: dict[str, list] = {}
+        self._position: dict[int, int] = {}
+        self._class_matches: dict[re.Pattern, list] = {}
+        name, get = document.name, document.get
+        for position, element in enumerate(document.elements()):
+            self._position[id(element)] = position
+            self.by_name.setdefault(name(element), []).append(element)
+            qa_id = get(element, 'data-qa-id')
+            if qa_id is not None:
+                self.by_qa_id.setdefault(qa_id, []).append(element)
+            classes = get(element, 'class')
+            if classes:
+                keys = set(classes)
+                if len(classes) != 1:
+                    keys.add(" ".join(classes))
+                for key in keys:
+                    self.by_class.setdefault(key, []).append(element)
+
+    def _with_class(self, rule) -> list:
+        if isinstance(rule, str):
+            return self.by_class.get(rule, [])
+        if rule not in self._class_matches:
+            elements = {}
+            for key, bucket in self.by_class.items():
+                if rule.search(key):
+                    elements.update((id(element), element) for element in bucket)
+            self._class_matches[rule] = sorted(elements.values(), key=lambda element: self._position[id(element)])
+        return self._class_matches[rule]
+
+    def find_all(self, name: str, attrs: dict, within=None) -> list:
+        """Elements named `name` matching `attrs` (bs4 style, class_ for class), optionally only inside `within`."""
+        return self.select(name, {('class' if key == 'class_' else key): rule for key, rule in attrs.items()}, within)
+
+    def select(self, name: str, attrs: dict, within=None) -> list:
+        """find_all() for attrs that already say class rather than class_."""
+        qa_id = attrs.get('data-qa-id')
+        if isinstance(qa_id, str):
+            candidates = self.by_qa_id.get(qa_id, [])
+        elif isinstance(attrs.get('class'), (str, re.Pattern)):
+            candidates = self._with_class(attrs['class'])
+        else:
+            candidates = self.by_name.get(name, [])
+        document = self.document
+        return [
+            element for element in candidates
+            if document.name(element) == name
+            and all(_attribute_matches(document, element, attr, rule) for attr, rule in attrs.items())
+            and (within is None or document.contains(within, element))
+        ]
+
+    def find(self, name: str, attrs: dict, within=None):
+        found = self.find_all(name, attrs, within)
+        return found[0] if found else None
@@ -1,15 +1,55 @@
-from bs4 import BeautifulSoup, Tag
 import re
 import os
 import random
 
+from .profile_dom import ElementIndex, parse_document
+from .profile_selectors import profile_selectors
+from ..utils.config import PROFILE_PARSER_BACKEND
+
+# Compiled once for every page
+EXPERIENCE_IN_ELEMENT = re.compile(r'(\d+)\s*(?:year|yr)', re.I)
+EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)\s*years?\s*(?:of\s*)?experience', re.I),
+    re.compile(r'(\d+)\s*yrs?\s*(?:of\s*)?experience', re.I),
+]
+RECOMMENDATION_WITH_PATIENTS = re.compile(r'(\d+)%\s*\((\d+)\s*patients?\)', re.I)
+PERCENTAGE = re.compile(r'(\d+)%')
+REVIEW_COUNT_PATTERNS = [
+    re.compile(r'\((\d+)\)', re.I),  # FIXED: Proper raw string
+    re.compile(r'(\d+)\s*review', re.I),
+]
+REVIEW_SKIP_PHRASES = ['read more', 'show more', 'view all', 'write a review', 'book appointment', 'call now']
+PHONE_IN_PAGE = re.compile(r'\+91\d{10}')
+EMAIL_IN_TEXT = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+NOT_LETTER_OR_SPACE = re.compile(r'[^a-zA-Z\s]')
+NOT_LETTER = re.compile(r'[^a-zA-Z]')
+NOT_PHONE_CHAR = re.compile(r'[^\d+]')
+VALID_PHONE_PATTERNS = [
+    re.compile(r'^\+91[6-9]\d{9}$'),
+    re.compile(r'^91[6-9]\d{9}$'),
+    re.compile(r'^[6-9]\d{9}$'),
+]
+VALID_EMAIL = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
 class ProfileScraper:
-    """Complete ProfileScraper with all methods and fixed regex patterns."""
+    """
+    Complete ProfileScraper with all methods and fixed regex patterns.
+    The page is parsed by the configured DOM backend (see profile_dom) and
+    walked once into an ElementIndex; its flattened text and the doctor's name
+    are worked out once and shared by the extractors. Elements are looked up
+    through the selector spec in profile_selectors.
+    """
     
-    def __init__(self, html_content: str, debug_mode: bool = False, save_debug_html: bool = False):
-        self.soup = BeautifulSoup(html_content, 'lxml')
+    def __init__(self, html_content: str, debug_mode: bool = False, save_debug_html: bool = False,
+                 backend: str = PROFILE_PARSER_BACKEND):
+        self.document = parse_document(html_content, backend)
         self.debug_mode = debug_mode
         self.html_content = html_content
+        self._index = None
+        self._all_text = None
+        self._doctor_name = None
+        self._doctor_name_found = False
         
         if save_debug_html:
             self._save_debug_html()
@@ -26,16 +66,21 @@ class ProfileScraper:
         with open(filename, 'w', encoding='utf-8') as f:
             f.write(self.html_content)
 
-    def _get_text_or_none(self, element: Tag | None) -> str | None:
-        return element.get_text(strip=True) if element else None
+    @property
+    def index(self) -> ElementIndex:
+        if self._index is None:
+            self._index = ElementIndex(self.document)
+        return self._index
 
-    def _find_first(self, selectors: list[tuple[str, dict]]) -> Tag | None:
-        """Tries a list of selectors and returns the first element found."""
-        for tag, attrs in selectors:
-            element = self.soup.find(tag, **attrs)
-            if element:
-                return element
-        return None
+    @property
+    def all_text(self) -> str:
+        """Text of the whole page, flattened once."""
+        if self._all_text is None:
+            self._all_text = self.document.document_text()
+        return self._all_text
+
+    def _get_text_or_none(self, element) -> str | None:
+        return self.document.text(element) if element is not None else None
 
     def extract_data(self) -> dict:
         """Main data extraction method."""
@@ -60,39 +105,22 @@ class ProfileScraper:
 
     def extract_doctor_name(self) -> str | None:
         """Extract doctor name."""
-        selectors = [
-            ('h1', {'class_': 'u-title', 'data-qa-id': 'doctor-name'}),
-            ('h1', {'class_': 'c-profile__title'}),
-            ('h1', {'data-qa-id': 'doctor-name'}),
-        ]
-        return self._get_text_or_none(self._find_first(selectors))
+        if not self._doctor_name_found:
+            self._doctor_name = self._get_text_or_none(profile_selectors.find(self.index, 'doctor_name'))
+            self._doctor_name_found = True
+        return self._doctor_name
 
     def extract_specialty(self) -> str | None:
         """Extract specialty."""
-        container = self.soup.find('div', class_='c-profile--qualification')
-        if container:
-            specialty_tag = container.find('h2', class_='c-profile__details')
-            if specialty_tag:
-                return self._get_text_or_none(specialty_tag)
-        
-        selectors = [
-            ('h2', {'class_': 'c-profile__details'}),
-            ('p', {'class_': 'u-large-font'}),
-        ]
-        return self._get_text_or_none(self._find_first(selectors))
+        return self._get_text_or_none(profile_selectors.find(self.index, 'specialty'))
 
     def extract_experience(self) -> int | None:
         """Extract years of experience."""
-        selectors = [
-            ('span', {'data-qa-id': 'years_of_experience'}),
-        ]
-        
-        for tag, attrs in selectors:
-            elements = self.soup.find_all(tag, **attrs)
+        for elements in profile_selectors.matches(self.index, 'experience'):
             for element in elements:
                 text = self._get_text_or_none(element)
                 if text and ('year' in text.lower() or 'experience' in text.lower()):
-                    match = re.search(r'(\d+)\s*(?:year|yr)', text, re.I)
+                    match = EXPERIENCE_IN_ELEMENT.search(text)
                     if match:
                         try:
                             return int(match.group(1))
@@ -100,14 +128,8 @@ class ProfileScraper:
                             continue
         
         # Fallback: search all text
-        all_text = self.soup.get_text()
-        experience_patterns = [
-            r'(\d+)\s*years?\s*(?:of\s*)?experience',
-            r'(\d+)\s*yrs?\s*(?:of\s*)?experience',
-        ]
-        
-        for pattern in experience_patterns:
-            match = re.search(pattern, all_text, re.I)
+        for pattern in EXPERIENCE_PATTERNS:
+            match = pattern.search(self.all_text)
             if match:
                 try:
                     return int(match.group(1))
@@ -118,17 +140,15 @@ class ProfileScraper:
 
     def extract_recommendation(self) -> int | None:
         """Extract recommendation percentage."""
-        all_text = self.soup.get_text()
-        
         # Look for "100% (22 patients)" pattern
-        match = re.search(r'(\d+)%\s*\((\d+)\s*patients?\)', all_text, re.I)
+        match = RECOMMENDATION_WITH_PATIENTS.search(self.all_text)
         if match:
             percentage = int(match.group(1))
             if 0 <= percentage <= 100:
                 return percentage
         
         # Fallback: just look for percentage
-        match = re.search(r'(\d+)%', all_text)
+        match = PERCENTAGE.search(self.all_text)
         if match:
             percentage = int(match.group(1))
             if 0 <= percentage <= 100:
@@ -138,20 +158,11 @@ class ProfileScraper:
 
     def extract_clinic_name(self) -> str | None:
         """Extract clinic name."""
-        selectors = [
-            ('a', {'class_': 'c-profile--clinic__name'}),
-            ('p', {'class_': 'u-bold u-d-inline-block u-valign--middle'}),
-            ('p', {'data-qa-id': 'doctor_clinic_name'}),
-        ]
-        return self._get_text_or_none(self._find_first(selectors))
+        return self._get_text_or_none(profile_selectors.find(self.index, 'clinic_name'))
 
     def extract_address(self) -> str | None:
         """Extract address."""
-        selectors = [
-            ('p', {'data-qa-id': 'clinic-address'}),
-            ('p', {'data-qa-id': 'practice-address'}),
-        ]
-        return self._get_text_or_none(self._find_first(selectors))
+        return self._get_text_or_none(profile_selectors.find(self.index, 'address'))
 
     def extract_reviews_and_ratings(self) -> dict:
         """Extract ratings and reviews with WORKING selectors and FIXED regex."""
@@ -159,21 +170,12 @@ class ProfileScraper:
         
         try:
             # Get total reviews - FIXED REGEX
-            review_selectors = [
-                ('li', {'data-qa-id': 'feedback-tab'}),
-            ]
-            
-            for tag, attrs in review_selectors:
-                elements = self.soup.find_all(tag, **attrs)
+            for elements in profile_selectors.matches(self.index, 'review_count'):
                 for element in elements:
                     text = self._get_text_or_none(element)
                     if text:
-                        patterns = [
-                            r'\((\d+)\)',  # FIXED: Proper raw string
-                            r'(\d+)\s*review',
-                        ]
-                        for pattern in patterns:
-                            match = re.search(pattern, text, re.I)
+                        for pattern in REVIEW_COUNT_PATTERNS:
+                            match = pattern.search(text)
                             if match:
                                 try:
                                     summary['total_reviews'] = int(match.group(1))
@@ -184,42 +186,20 @@ class ProfileScraper:
                             break
             
             # Get overall star rating
-            rating_selectors = [
-                ('span', {'class_': 'common__star-rating__value'}),
-            ]
-            
-            for tag, attrs in rating_selectors:
-                element = self.soup.find(tag, **attrs)
-                if element:
-                    summary['overall_rating'] = self._get_text_or_none(element)
-                    break
+            element = profile_selectors.find(self.index, 'overall_rating')
+            if element is not None:
+                summary['overall_rating'] = self._get_text_or_none(element)
             
             # SIMPLIFIED BUT WORKING review text extraction
-            # Use the SAME working selectors that got you reviews before
-            review_text_selectors = [
-                ('div', {'class_': 'feedback__content'}),
-                ('p', {'class_': 'feedback__content'}),
-                ('span', {'class_': 'feedback__content'}),
-                ('div', {'class_': re.compile(r'.*review.*content.*', re.I)}),
-                ('p', {'class_': re.compile(r'.*review.*content.*', re.I)}),
-                ('div', {'class_': re.compile(r'.*feedback.*text.*', re.I)}),
-                ('p', {'class_': re.compile(r'.*feedback.*text.*', re.I)}),
-            ]
-            
-            found_reviews = set()
-            for tag, attrs in review_text_selectors:
-                review_elements = self.soup.find_all(tag, **attrs)
+            found_reviews = {}  # insertion-ordered, so the same page always gives the same reviews
+            for review_elements in profile_selectors.matches(self.index, 'review_text'):
                 for review_element in review_elements:
                     review_text = self._get_text_or_none(review_element)
                     if review_text and len(review_text) > 20:
                         cleaned_review = review_text.strip()
-                        skip_phrases = [
-                            'read more', 'show more', 'view all', 'write a review',
-                            'book appointment', 'call now'
-                        ]
-                        if not any(phrase in cleaned_review.lower() for phrase in skip_phrases):
+                        if not any(phrase in cleaned_review.lower() for phrase in REVIEW_SKIP_PHRASES):
                             if 20 <= len(cleaned_review) <= 400:
-                                found_reviews.add(cleaned_review)
+                                found_reviews[cleaned_review] = None
             
             summary['reviews_summary'] = list(found_reviews)[:8]
             
@@ -228,19 +208,33 @@ class ProfileScraper:
         
         return summary
 
+    def find_real_contact_number(self) -> str | None:
+        """Returns the contact number shown on the page, or None if it is not there (yet)."""
+        if '+91' in self.html_content:
+            # Only the first number on the page is considered
+            match = PHONE_IN_PAGE.search(self.html_content)
+            if match:
+                phone = match.group(0)
+                if self._validate_phone_number(phone):
+                    return phone
+        return None
+
+    def has_call_button(self) -> bool:
+        """True if the profile offers a "Call Now" button that reveals the number."""
+        if profile_selectors.find(self.index, 'call_button') is not None:
+            return True
+        return any('call now' in self.document.text(button).lower() for button in self.index.by_name.get('button', []))
+
     def extract_contact_number(self) -> dict:
         """Extract contact number with fallback to generated number."""
         # Try to extract real contact number
-        if '+91' in self.html_content:
-            phone_instances = re.findall(r'\+91\d{10}', self.html_content)
-            if phone_instances:
-                phone = phone_instances[0]
-                if self._validate_phone_number(phone):
-                    return {
-                        "number": phone,
-                       # "type": "REAL",
-                        #"source": "SCRAPED_FROM_PLATFORM"
-                    }
+        phone = self.find_real_contact_number()
+        if phone:
+            return {
+                "number": phone,
+               # "type": "REAL",
+                #"source": "SCRAPED_FROM_PLATFORM"
+            }
         
         # Generate realistic Indian mobile number
         first_digit = random.choice(['6', '7', '8', '9'])
@@ -256,22 +250,20 @@ class ProfileScraper:
     def extract_contact_email(self) -> dict:
         """Extract email with mixed approach."""
         # Try to find real email first
-        mailto_links = self.soup.find_all('a', href=re.compile(r'^mailto:', re.I))
-        for link in mailto_links:
-            href = link.get('href', '')
-            if href.startswith('mailto:'):
-                email = href.replace('mailto:', '').strip()
-                if self._validate_email(email) and 'support@practo.com' not in email:
-                    return {
-                        "email": email,
-                        #"type": "REAL",
-                        #"source": "SCRAPED_FROM_PLATFORM"
-                    }
+        for links in profile_selectors.matches(self.index, 'email_link'):
+            for link in links:
+                href = self.document.get(link, 'href') or ''
+                if href.startswith('mailto:'):
+                    email = href.replace('mailto:', '').strip()
+                    if self._validate_email(email) and 'support@practo.com' not in email:
+                        return {
+                            "email": email,
+                            #"type": "REAL",
+                            #"source": "SCRAPED_FROM_PLATFORM"
+                        }
         
         # Search page text for emails
-        all_text = self.soup.get_text()
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_matches = re.findall(email_pattern, all_text)
+        email_matches = EMAIL_IN_TEXT.findall(self.all_text)
         
         for email in email_matches:
             if self._validate_email(email) and 'support@practo.com' not in email:
@@ -285,15 +277,15 @@ class ProfileScraper:
         if random.random() < 0.65:
             doctor_name = self.extract_doctor_name()
             if doctor_name:
-                name_clean = re.sub(r'[^a-zA-Z\s]', '', doctor_name.lower())
+                name_clean = NOT_LETTER_OR_SPACE.sub('', doctor_name.lower())
                 name_parts = name_clean.split()
                 
                 if len(name_parts) >= 2:
                     first_name = name_parts[1] if name_parts[0] == 'dr' else name_parts[0]
                     last_name = name_parts[-1]
                     
-                    first_name = re.sub(r'[^a-zA-Z]', '', first_name)
-                    last_name = re.sub(r'[^a-zA-Z]', '', last_name)
+                    first_name = NOT_LETTER.sub('', first_name)
+                    last_name = NOT_LETTER.sub('', last_name)
                     
                     if first_name and last_name:
                         email_username = f"{first_name}.{last_name}"
@@ -331,19 +323,13 @@ class ProfileScraper:
         if not phone:
             return False
             
-        clean_phone = re.sub(r'[^\d+]', '', phone)
+        clean_phone = NOT_PHONE_CHAR.sub('', phone)
         
         if len(clean_phone) < 10:
             return False
         
-        patterns = [
-            r'^\+91[6-9]\d{9}$',
-            r'^91[6-9]\d{9}$',
-            r'^[6-9]\d{9}$',
-        ]
-        
-        for pattern in patterns:
-            if re.match(pattern, clean_phone):
+        for pattern in VALID_PHONE_PATTERNS:
+            if pattern.match(clean_phone):
                 return True
         
         return False
@@ -353,5 +339,4 @@ class ProfileScraper:
         if not email:
             return False
         
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return bool(VALID_EMAIL.match(email))
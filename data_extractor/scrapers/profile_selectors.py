@@ -0,0 +1,260 @@
+# data_extractor/scrapers/profile_selectors.py : Declarative selectors for ProfileScraper, with hit/miss statistics.
+
+import json
+import os
+import re
+import time
+
+from ..utils.config import SELECTOR_REORDER_INTERVAL
+from ..utils.logger import app_logger
+
+REVIEW_CONTENT_CLASS = re.compile(r'review.*content', re.I)
+FEEDBACK_TEXT_CLASS = re.compile(r'feedback.*text', re.I)
+MAILTO = re.compile(r'^mailto:', re.I)
+
+# Every field's selectors: (tag, attrs) in the style of BeautifulSoup's find(), or
+# (tag, attrs, (tag, attrs)) to look only inside the first element the last part finds.
+# How a field uses its selectors:
+#   "first": the first selector, in the order given, that finds an element wins;
+#            the selectors find different things and the earlier ones are preferred
+#   "any":   alternative markups of the same element; the first selector that finds
+#            one wins, and the ones that hit most often are tried first
+#   "all":   the elements of every selector are used, in the order given
+PROFILE_SELECTORS = {
+    "doctor_name": {"mode": "any", "selectors": [
+        ('h1', {'class_': 'u-title', 'data-qa-id': 'doctor-name'}),
+        ('h1', {'class_': 'c-profile__title'}),
+        ('h1', {'data-qa-id': 'doctor-name'}),
+    ]},
+    "specialty": {"mode": "first", "selectors": [
+        ('h2', {'class_': 'c-profile__details'}, ('div', {'class_': 'c-profile--qualification'})),
+        ('h2', {'class_': 'c-profile__details'}),
+        ('p', {'class_': 'u-large-font'}),
+    ]},
+    "experience": {"mode": "all", "selectors": [
+        ('span', {'data-qa-id': 'years_of_experience'}),
+    ]},
+    "clinic_name": {"mode": "any", "selectors": [
+        ('a', {'class_': 'c-profile--clinic__name'}),
+        ('p', {'class_': 'u-bold u-d-inline-block u-valign--middle'}),
+        ('p', {'data-qa-id': 'doctor_clinic_name'}),
+    ]},
+    "address": {"mode": "any", "selectors": [
+        ('p', {'data-qa-id': 'clinic-address'}),
+        ('p', {'data-qa-id': 'practice-address'}),
+    ]},
+    "review_count": {"mode": "all", "selectors": [
+        ('li', {'data-qa-id': 'feedback-tab'}),
+    ]},
+    "overall_rating": {"mode": "any", "selectors": [
+        ('span', {'class_': 'common__star-rating__value'}),
+    ]},
+    "review_text": {"mode": "all", "selectors": [
+        ('div', {'class_': 'feedback__content'}),
+        ('p', {'class_': 'feedback__content'}),
+        ('span', {'class_': 'feedback__content'}),
+        ('div', {'class_': REVIEW_CONTENT_CLASS}),
+        ('p', {'class_': REVIEW_CONTENT_CLASS}),
+        ('div', {'class_': FEEDBACK_TEXT_CLASS}),
+        ('p', {'class_': FEEDBACK_TEXT_CLASS}),
+    ]},
+    "call_button": {"mode": "any", "selectors": [
+        ('button', {'data-qa-id': 'call_button'}),
+    ]},
+    "email_link": {"mode": "all", "selectors": [
+        ('a', {'href': MAILTO}),
+    ]},
+}
+SELECTOR_MODES = ("first", "any", "all")
+
+
+def _describe(tag: str, attrs: dict) -> str:
+    """CSS-like label for a selector, e.g. h1.c-profile__title or a[href~=/^mailto:/]."""
+    label = tag
+    for attr, rule in attrs.items():
+        if isinstance(rule, re.Pattern):
+            label += f"[{attr}~=/{rule.pattern}/]"
+        elif attr == 'class' and ' ' not in rule:
+            label += f".{rule}"
+        else:
+            label += f'[{attr}="{rule}"]'
+    return label
+
+
+class Selector:
+    """One compiled lookup and its counters."""
+
+    def __init__(self, position: int, tag: str, attrs: dict, within: tuple | None = None):
+        self.position = position
+        self.tag = tag
+        self.attrs = {('class' if key == 'class_' else key): rule for key, rule in attrs.items()}
+        self.within = Selector(position, *within) if within else None
+        self.label = _describe(tag, self.attrs)
+        if self.within:
+            self.label = f"{self.within.label} {self.label}"
+        self.attempts = 0
+        self.hits = 0
+        self.hit_ns = 0
+        self.miss_ns = 0
+
+    def find_all(self, index) -> list:
+        if self.within is None:
+            return index.select(self.tag, self.attrs)
+        containers = self.within.find_all(index)
+        return index.select(self.tag, self.attrs, within=containers[0]) if containers else []
+
+    @property
+    def hit_rate(self) -> float:
+        # Smoothed, so a selector that was never tried ranks above one that keeps missing
+        return (self.hits + 1) / (self.attempts + 2)
+
+
+class FieldSelectors:
+    """The selectors of one field, in the order they are currently tried."""
+
+    def __init__(self, field: str, mode: str, selectors: list[tuple]):
+        if mode not in SELECTOR_MODES:
+            raise ValueError(f"Selector mode for {field!r} must be one of {SELECTOR_MODES}, not {mode!r}")
+        self.field = field
+        self.mode = mode
+        self.selectors = [Selector(position, *selector) for position, selector in enumerate(selectors)]
+        self.order = list(self.selectors)
+        self.lookups = 0
+
+    def _lookup(self, selector: Selector, index) -> list:
+        start = time.perf_counter_ns()
+        elements = selector.find_all(index)
+        elapsed = time.perf_counter_ns() - start
+        selector.attempts += 1
+        if elements:
+            selector.hits += 1
+            selector.hit_ns += elapsed
+        else:
+            selector.miss_ns += elapsed
+        return elements
+
+    def ranked(self) -> list[Selector]:
+        """The order the counters so far call for: by hit rate for "any" fields, as declared otherwise."""
+        if self.mode != "any":
+            return list(self.selectors)
+        return sorted(self.selectors, key=lambda selector: (-selector.hit_rate, selector.position))
+
+    def _reorder(self):
+        order = self.ranked()
+        if order != self.order:
+            self.order = order
+            app_logger.info(f"Selectors for {self.field} now tried in the order: {', '.join(s.label for s in order)}")
+
+    def find(self, index):
+        """The element the field's selectors find first, or None."""
+        self.lookups += 1
+        if self.mode == "any" and SELECTOR_REORDER_INTERVAL and self.lookups % SELECTOR_REORDER_INTERVAL == 0:
+            self._reorder()
+        for selector in self.order:
+            elements = self._lookup(selector, index)
+            if elements:
+                return elements[0]
+        return None
+
+    def matches(self, index):
+        """The elements of each selector in turn; selectors the caller does not get to are not run."""
+        self.lookups += 1
+        for selector in self.order:
+            yield self._lookup(selector, index)
+
+
+class SelectorSpec:
+    """
+    A compiled selector spec. Counts, per selector, how often it was tried,
+    how often it found something and the time spent on hits and on misses,
+    so drifting markup shows up as selectors that keep missing (and what the
+    misses cost). The counters can be merged across processes.
+    """
+
+    def __init__(self, spec: dict):
+        self.fields = {
+            field: FieldSelectors(field, entry["mode"], entry["selectors"])
+            for field, entry in spec.items()
+        }
+        self._reported: dict[tuple[str, str], tuple] = {}
+
+    def find(self, index, field: str):
+        return self.fields[field].find(index)
+
+    def matches(self, index, field: str):
+        return self.fields[field].matches(index)
+
+    def snapshot(self) -> dict:
+        """{field: {selector: [attempts, hits, hit_ns, miss_ns]}} for every selector tried so far."""
+        return {
+            field: {
+                s.label: [s.attempts, s.hits, s.hit_ns, s.miss_ns]
+                for s in selectors.selectors if s.attempts
+            }
+            for field, selectors in self.fields.items()
+        }
+
+    def drain(self) -> dict:
+        """Like snapshot(), but only what changed since the last drain()."""
+        changes = {}
+        for field, counters in self.snapshot().items():
+            for label, values in counters.items():
+                reported = self._reported.get((field, label), (0, 0, 0, 0))
+                if reported[0] != values[0]:
+                    changes.setdefault(field, {})[label] = [now - before for now, before in zip(values, reported)]
+                    self._reported[(field, label)] = tuple(values)
+        return changes
+
+    def merge(self, snapshot: dict):
+        """Adds the counters of another process' snapshot() or drain()."""
+        for field, counters in snapshot.items():
+            selectors = {s.label: s for s in self.fields[field].selectors}
+            for label, (attempts, hits, hit_ns, miss_ns) in counters.items():
+                selector = selectors[label]
+                selector.attempts += attempts
+                selector.hits += hits
+                selector.hit_ns += hit_ns
+                selector.miss_ns += miss_ns
+
+    def stats(self) -> dict:
+        """Per field: its mode and its selectors, ranked as the counters call for, with their counters."""
+        return {
+            field: {
+                "mode": selectors.mode,
+                "selectors": [
+                    {
+                        "selector": s.label,
+                        "declared_position": s.position,
+                        "attempts": s.attempts,
+                        "hits": s.hits,
+                        "misses": s.attempts - s.hits,
+                        "hit_rate": round(s.hits / s.attempts, 3) if s.attempts else None,
+                        "hit_ms": round(s.hit_ns / 1e6, 3),
+                        "miss_ms": round(s.miss_ns / 1e6, 3),
+                    }
+                    for s in selectors.ranked()
+                ],
+            }
+            for field, selectors in self.fields.items()
+        }
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.stats(), f, indent=2)
+
+    def log_summary(self):
+        for field, entry in self.stats().items():
+            for s in entry["selectors"]:
+                if not s["attempts"]:
+                    continue
+                line = (f"Selector [{field}] {s['selector']}: {s['hits']}/{s['attempts']} hits "
+                        f"({s['hit_rate']:.0%}), {s['hit_ms'] + s['miss_ms']:.1f} ms")
+                if s["misses"] and not s["hits"]:
+                    app_logger.warning(f"{line}, never matched ({s['miss_ms']:.1f} ms spent on misses)")
+                else:
+                    app_logger.info(line)
+
+
+# Shared by every ProfileScraper in the process
+profile_selectors = SelectorSpec(PROFILE_SELECTORS)
@@ -0,0 +1,134 @@
+# data_extractor/scrapers/request_blocker.py
+
+from collections import Counter
+from urllib.parse import urlsplit
+
+from ..utils.logger import app_logger
+from ..utils.rate_limiter import rate_limiter
+
+# Browser-measured time from navigation start to DOMContentLoaded, in ms
+DOMCONTENTLOADED_JS = """() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    return nav ? nav.domContentLoadedEventEnd - nav.startTime : null;
+}"""
+
+
+def _matches(host: str, domains: list[str]) -> bool:
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+class RequestBlocker:
+    """
+    Request-interception profile for a browser context. Aborts requests whose
+    resource type is in `blocked_types`, whose host is in `blocked_domains`, or,
+    when `allowed_domains` is non-empty, whose host is not in it. The page
+    document itself is only ever blocked by domain.
+    """
+
+    def __init__(self, blocked_types: list[str], allowed_domains: list[str], blocked_domains: list[str]):
+        self.blocked_types = set(blocked_types)
+        self.allowed_domains = allowed_domains
+        self.blocked_domains = blocked_domains
+        self.allowed = 0
+        self.blocked = Counter()  # reason -> requests aborted
+
+    def block_reason(self, resource_type: str, host: str) -> str | None:
+        if _matches(host, self.blocked_domains):
+            return "denied domain"
+        if self.allowed_domains and not _matches(host, self.allowed_domains):
+            return "domain not allowed"
+        if resource_type != "document" and resource_type in self.blocked_types:
+            return resource_type
+        return None
+
+    async def attach(self, context):
+        await context.route("**/*", self._handle)
+
+    async def _handle(self, route):
+        request = route.request
+        reason = self.block_reason(request.resource_type, urlsplit(request.url).hostname or "")
+        if reason:
+            self.blocked[reason] += 1
+            await route.abort()
+        else:
+            self.allowed += 1
+            await route.continue_()
+
+    def stats(self) -> dict:
+        return {"allowed": self.allowed, "blocked": sum(self.blocked.values()), "blocked_by_reason": dict(self.blocked)}
+
+
+class NetworkStats:
+    """Bytes transferred in a browser context and time to DOMContentLoaded per page."""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.pages = 0
+        self.domcontentloaded_ms: list[float] = []
+
+    def attach(self, context):
+        context.on("requestfinished", self._on_request_finished)
+
+    async def _on_request_finished(self, request):
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        self.requests += 1
+        self.bytes += sizes["responseHeadersSize"] + sizes["responseBodySize"]
+
+    async def record_navigation(self, page):
+        self.pages += 1
+        try:
+            elapsed = await page.evaluate(DOMCONTENTLOADED_JS)
+        except Exception:
+            return
+        if elapsed:
+            self.domcontentloaded_ms.append(elapsed)
+
+    def summary(self) -> dict:
+        pages = max(self.pages, 1)
+        timings = self.domcontentloaded_ms
+        return {
+            "pages": self.pages,
+            "requests_per_page": round(self.requests / pages, 1),
+            "kb_per_page": round(self.bytes / pages / 1024, 1),
+            "domcontentloaded_ms": round(sum(timings) / len(timings)) if timings else None,
+        }
+
+
+async def measure_baseline(browser, urls: list[str], ready_selector: str) -> dict:
+    """Loads a few pages with nothing blocked, as the reference for the savings report."""
+    context = await browser.new_context()
+    stats = NetworkStats()
+    stats.attach(context)
+    page = await context.new_page()
+    try:
+        for url in urls:
+            try:
+                await rate_limiter.acquire(url)
+                await page.goto(url, timeout=60000, wait_until='domcontentloaded')
+                await page.wait_for_selector(ready_selector, timeout=20000)
+                await stats.record_navigation(page)
+            except Exception as e:
+                app_logger.warning(f"Baseline load of {url} failed: {e}")
+    finally:
+        await context.close()
+    return stats.summary()
+
+
+def log_savings(baseline: dict | None, blocked: dict, blocker: RequestBlocker):
+    """Logs the blocker's counters and, with a baseline, bytes saved and latency gained per page."""
+    stats = blocker.stats()
+    app_logger.info(f"Request blocking: {stats['blocked']} requests aborted, {stats['allowed']} allowed ({stats['blocked_by_reason']})")
+    app_logger.info(f"With blocking: {blocked['kb_per_page']} KB, {blocked['requests_per_page']} requests per page, DOMContentLoaded {blocked['domcontentloaded_ms']} ms")
+    if not baseline or not baseline["pages"]:
+        return
+    app_logger.info(f"Without blocking ({baseline['pages']} sample pages): {baseline['kb_per_page']} KB, {baseline['requests_per_page']} requests per page, DOMContentLoaded {baseline['domcontentloaded_ms']} ms")
+    if baseline["kb_per_page"]:
+        saved = baseline["kb_per_page"] - blocked["kb_per_page"]
+        app_logger.info(f"Bytes saved: {saved:.1f} KB per page ({saved / baseline['kb_per_page']:.0%})")
+    if baseline["domcontentloaded_ms"] and blocked["domcontentloaded_ms"]:
+        gained = baseline["domcontentloaded_ms"] - blocked["domcontentloaded_ms"]
+        app_logger.info(f"Time to DOMContentLoaded: {gained} ms faster per page ({gained / baseline['domcontentloaded_ms']:.0%})")
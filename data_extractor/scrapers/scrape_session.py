@@ -0,0 +1,382 @@
+# data_extractor/scrapers/scrape_session.py
+
+import asyncio
+import statistics
+import time
+from collections import Counter
+from functools import partial
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from tqdm.asyncio import tqdm
+
+try:
+    import psutil
+except ImportError:  # optional: only needed for memory-based recycling
+    psutil = None
+
+from .profile_scraper import ProfileScraper
+from .page_worker_pool import PageWorkerPool
+from .http_fetcher import HttpProfileFetcher
+from .request_blocker import NetworkStats, RequestBlocker, log_savings, measure_baseline
+from ..utils.config import (
+    PAGE_WORKERS,
+    BLOCK_REQUESTS,
+    BLOCKED_RESOURCE_TYPES,
+    ALLOWED_DOMAINS,
+    BLOCKED_DOMAINS,
+    BLOCKING_BASELINE_PAGES,
+    HTTP_FIRST,
+    ARCHIVE_HTML,
+    HTML_ARCHIVE_DIR,
+    CALL_BUTTON_WAIT_MS,
+    CONTACT_WAIT_MS,
+    CONTACT_POLL_MS,
+    CONTEXT_MAX_PAGES,
+    BROWSER_MAX_PAGES,
+    BROWSER_MAX_RSS_MB,
+    MEMORY_CHECK_PAGES,
+    HTTP_FETCH_CONCURRENCY,
+)
+from ..utils.html_archive import HtmlArchive, content_hash
+from ..utils.logger import app_logger
+from ..utils.rate_limiter import rate_limiter
+
+# Present once the profile content has rendered
+PROFILE_READY_SELECTOR = "div.c-profile--clinic--item"
+CALL_BUTTON_SELECTOR = 'button[data-qa-id="call_button"], button:has-text("Call Now")'
+# The same pattern ProfileScraper.find_real_contact_number reads from the HTML
+CONTACT_NUMBER_JS = r"() => /\+91\d{10}/.test(document.documentElement.outerHTML)"
+
+
+async def reveal_contact(page) -> tuple[bool, float | None]:
+    """
+    Clicks "Call Now" if the rendered profile shows one within
+    CALL_BUTTON_WAIT_MS and waits until the number is in the page, at most
+    CONTACT_WAIT_MS. Returns whether it
+    clicked and the click-to-number latency in ms (None if it never showed).
+    Raises only if the click itself did not happen.
+    """
+    try:
+        # The button can render a moment after the profile content
+        call_button = await page.wait_for_selector(CALL_BUTTON_SELECTOR, timeout=CALL_BUTTON_WAIT_MS)
+    except PlaywrightTimeoutError:
+        return False, None
+    start = time.perf_counter()
+    await call_button.click()
+    try:
+        await page.wait_for_function(CONTACT_NUMBER_JS, polling=CONTACT_POLL_MS, timeout=CONTACT_WAIT_MS)
+    except PlaywrightTimeoutError:
+        return True, None
+    except Exception as e:
+        app_logger.debug(f"Waiting for the number after the Call Now click failed: {e}")
+        return True, None
+    return True, (time.perf_counter() - start) * 1000
+
+
+async def scrape_on_page(page, url: str, network_stats: NetworkStats | None = None, archive: HtmlArchive | None = None) -> dict:
+    """Navigates an open page to `url` and scrapes it, clicking the contact button."""
+    try:
+        # Navigations share the host's budget with the plain HTTP fetches
+        await rate_limiter.acquire(url)
+        await page.goto(url, timeout=60000, wait_until='domcontentloaded')
+        await page.wait_for_selector(PROFILE_READY_SELECTOR, timeout=20000)
+        if network_stats:
+            await network_stats.record_navigation(page)
+
+        # Click “Call Now” if present
+        try:
+            clicked, latency_ms = await reveal_contact(page)
+        except Exception as e:
+            app_logger.debug(f"Call Now click failed on {url}: {e}")
+            clicked, latency_ms = False, None
+
+        html_content = await page.content()
+        if archive:
+            page_hash = await asyncio.to_thread(archive.put, url, html_content)
+        else:
+            page_hash = content_hash(html_content)
+        scraper = ProfileScraper(html_content, debug_mode=False, save_debug_html=False)
+        raw_data = scraper.extract_data()
+        raw_data['source_url'] = url
+
+        return {
+            "url": url,
+            "status": "scraped",
+            "raw_data": raw_data,
+            "content_hash": page_hash,
+            "contact_clicked": clicked,
+            "contact_latency_ms": round(latency_ms) if latency_ms is not None else None,
+        }
+
+    except PlaywrightTimeoutError:
+        app_logger.error(f"Timeout waiting for content on {url}. Skipping.")
+        return {"url": url, "status": "timeout_error", "raw_data": None}
+    except Exception as e:
+        app_logger.error(f"Failed to scrape {url}: {e}")
+        return {"url": url, "status": "fetch_failed", "raw_data": None}
+
+
+class ProfileScrapeSession:
+    """
+    Scrapes profile URLs over plain HTTP first (HTTP_FIRST) and in a browser
+    for the ones that need it. A URL goes to the browser's page workers as
+    soon as its HTTP result says so, so both paths run at the same time. The
+    browser and its page workers are started on first use and kept for the
+    whole session; counters cover every call. With ARCHIVE_HTML, every page
+    fetched on either path is archived.
+
+    The browser's memory is sampled every MEMORY_CHECK_PAGES pages while pages
+    keep running. The context is replaced after CONTEXT_MAX_PAGES pages, the
+    whole browser after BROWSER_MAX_PAGES, and both when it uses more than
+    BROWSER_MAX_RSS_MB; only then are the pages in flight drained first.
+    """
+
+    def __init__(self, playwright, progress: bool = True):
+        self.playwright = playwright
+        self.progress = progress
+        self.archive = HtmlArchive(HTML_ARCHIVE_DIR) if ARCHIVE_HTML else None
+        self.fetcher = HttpProfileFetcher(self.archive) if HTTP_FIRST else None
+        self.browser = None
+        self.context = None
+        self.pool = None
+        self._browser_lock = asyncio.Lock()
+        self.blocker = None
+        self.baseline = None
+        self.network_stats = NetworkStats()
+        self.via_http = 0
+        self.via_browser = 0
+        self.contact_clicks = 0
+        self.contact_latencies_ms = []
+        # Browser recycling
+        self.context_pages = 0
+        self.browser_pages = 0
+        self.pages_rendered = 0
+        self.recycled_contexts = 0
+        self.recycled_browsers = 0
+        self._sample_time = None
+        self._sample_pages = 0
+        self._rss = None   # MB at the last sample since the last recycle
+        self._recycling: asyncio.Task | None = None
+
+    async def _new_context(self):
+        self.context = await self.browser.new_context()
+        self.context_pages = 0
+        self.network_stats.attach(self.context)
+        if self.blocker:
+            await self.blocker.attach(self.context)
+
+    async def _start_browser(self, sample_urls: list[str]):
+        self.browser = await self.playwright.chromium.launch(headless=True)
+        self.browser_pages = 0
+        if BLOCK_REQUESTS and self.blocker is None:
+            if BLOCKING_BASELINE_PAGES:
+                self.baseline = await measure_baseline(self.browser, sample_urls[:BLOCKING_BASELINE_PAGES], PROFILE_READY_SELECTOR)
+            self.blocker = RequestBlocker(BLOCKED_RESOURCE_TYPES, ALLOWED_DOMAINS, BLOCKED_DOMAINS)
+        await self._new_context()
+        self._sample_time, self._sample_pages = time.monotonic(), self.pages_rendered
+        # A bounded set of reused pages pulling URLs from a queue
+        self.pool = PageWorkerPool(self.context, PAGE_WORKERS, self._render)
+
+    def _rss_mb(self) -> float | None:
+        """Resident memory of everything this process started: the Playwright driver and the browser."""
+        if psutil is None:
+            return None
+        try:
+            children = psutil.Process().children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for child in children:
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:   # exited since it was listed
+                pass
+        return total / (1024 * 1024)
+
+    def _sample_memory(self):
+        """Logs the browser's memory and throughput; pages keep running meanwhile."""
+        now = time.monotonic()
+        self._rss = self._rss_mb()
+        rate = (self.pages_rendered - self._sample_pages) / max(now - self._sample_time, 1e-6)
+        memory = f"{self._rss:.0f} MB RSS" if self._rss is not None else "RSS unknown (needs psutil)"
+        app_logger.info(f"Browser: {memory}, {self.context_pages} pages in this context, {self.browser_pages} in this browser, {rate:.2f} pages/s")
+        self._sample_time, self._sample_pages = now, self.pages_rendered
+
+    @staticmethod
+    def _over_memory(rss: float | None) -> bool:
+        return bool(BROWSER_MAX_RSS_MB and rss is not None and rss > BROWSER_MAX_RSS_MB)
+
+    def _recycle_due(self) -> bool:
+        return bool(
+            (BROWSER_MAX_PAGES and self.browser_pages >= BROWSER_MAX_PAGES)
+            or (CONTEXT_MAX_PAGES and self.context_pages >= CONTEXT_MAX_PAGES)
+            or self._over_memory(self._rss)
+        )
+
+    def _count_page(self):
+        self.context_pages += 1
+        self.browser_pages += 1
+        self.pages_rendered += 1
+        if MEMORY_CHECK_PAGES and self.pages_rendered % MEMORY_CHECK_PAGES == 0:
+            self._sample_memory()
+        if self._recycling is None and self._recycle_due():
+            self._recycling = asyncio.create_task(self._recycle_pool())
+
+    async def _recycle_pool(self):
+        """Lets the pages in flight finish, then recycles under the paused page workers."""
+        try:
+            await self.pool.pause()
+            await self._recycle()
+            self.pool.context = self.context
+        except Exception as e:
+            app_logger.error(f"Browser recycling failed: {e}")
+        finally:
+            self._recycling = None
+            self.pool.resume()
+
+    async def _recycle(self):
+        """Replaces the context or browser as due; only called with no page in flight."""
+        if BROWSER_MAX_PAGES and self.browser_pages >= BROWSER_MAX_PAGES:
+            await self._restart_browser(f"{self.browser_pages} pages")
+        elif self._over_memory(self._rss):
+            await self._recycle_context(f"{self._rss:.0f} MB RSS")
+            # A fresh context frees its pages; what is left belongs to the browser
+            rss = self._rss_mb()
+            if self._over_memory(rss):
+                await self._restart_browser(f"{rss:.0f} MB RSS with a fresh context")
+        elif CONTEXT_MAX_PAGES and self.context_pages >= CONTEXT_MAX_PAGES:
+            await self._recycle_context(f"{self.context_pages} pages")
+        # Memory is judged again from the next sample
+        self._rss = None
+
+    async def _recycle_context(self, reason: str):
+        app_logger.info(f"Recycling browser context after {reason}.")
+        await self.context.close()
+        await self._new_context()
+        self.recycled_contexts += 1
+
+    async def _restart_browser(self, reason: str):
+        app_logger.info(f"Restarting the browser after {reason}.")
+        await self.browser.close()
+        self.browser = await self.playwright.chromium.launch(headless=True)
+        self.browser_pages = 0
+        await self._new_context()
+        self.recycled_browsers += 1
+
+    async def _render(self, page, url: str) -> dict:
+        try:
+            return await scrape_on_page(page, url, self.network_stats, self.archive)
+        finally:
+            self._count_page()
+
+    async def _to_browser(self, url: str, on_done, sample_urls: list[str]):
+        async with self._browser_lock:
+            if self.browser is None:
+                await self._start_browser(sample_urls)
+        self.via_browser += 1
+        self.pool.put(url, on_done)
+
+    def _count_result(self, result: dict | None):
+        if result and result.get("contact_clicked"):
+            self.contact_clicks += 1
+            if result["contact_latency_ms"] is not None:
+                self.contact_latencies_ms.append(result["contact_latency_ms"])
+
+    async def scrape(self, urls: list[str], on_result=None) -> list | None:
+        """
+        Returns one result per URL, in the order of `urls`. With `on_result`,
+        `await on_result(url, result)` follows as soon as each URL is done, in
+        the order they finish, and nothing is kept or returned.
+        """
+        results = [None] * len(urls) if on_result is None else None
+        desc = "Testing Contact Extraction" if self.progress else None
+        with tqdm(total=len(urls), desc=desc, disable=desc is None) as progress:
+
+            async def done(index: int, result: dict | None):
+                self._count_result(result)
+                if on_result is None:
+                    results[index] = result
+                else:
+                    await on_result(urls[index], result)
+                progress.update(1)
+
+            remaining = iter(enumerate(urls))
+
+            async def http_worker():
+                for index, url in remaining:
+                    result = await self.fetcher.scrape(url)
+                    if result is None:
+                        # Plain HTML cannot serve this one: render it right away
+                        await self._to_browser(url, partial(done, index), urls)
+                    else:
+                        self.via_http += 1
+                        await done(index, result)
+
+            if self.fetcher:
+                await asyncio.gather(*(http_worker() for _ in range(min(HTTP_FETCH_CONCURRENCY, len(urls)))))
+            else:
+                for index, url in remaining:
+                    await self._to_browser(url, partial(done, index), urls)
+            if self.pool:
+                await self.pool.join()
+        return results
+
+    def counts(self) -> dict:
+        """Fetch-path counters, in a form that can be summed across processes."""
+        return {
+            "http": self.via_http,
+            "browser": self.via_browser,
+            "fallback_reasons": dict(self.fetcher.fallback_reasons) if self.fetcher else {},
+            "contact_clicks": self.contact_clicks,
+            "contact_latencies_ms": self.contact_latencies_ms,
+            "recycled_contexts": self.recycled_contexts,
+            "recycled_browsers": self.recycled_browsers,
+        }
+
+    def log_summary(self):
+        if self.blocker:
+            log_savings(self.baseline, self.network_stats.summary(), self.blocker)
+        log_fetch_paths(self.counts())
+
+    async def close(self):
+        if self._recycling:
+            await self._recycling
+        if self.pool:
+            await self.pool.close()
+        if self.fetcher:
+            await self.fetcher.aclose()
+        if self.browser:
+            await self.browser.close()
+        if self.archive:
+            self.archive.close()
+
+
+def log_fetch_paths(counts: dict):
+    total = counts["http"] + counts["browser"]
+    if not total:
+        return
+    app_logger.info(f"Fetch paths: {counts['http']}/{total} over HTTP ({counts['http'] / total:.0%}), {counts['browser']}/{total} in the browser ({counts['browser'] / total:.0%})")
+    if counts["fallback_reasons"]:
+        app_logger.info(f"Browser fallback reasons: {counts['fallback_reasons']}")
+    latencies = counts["contact_latencies_ms"]
+    if counts["contact_clicks"]:
+        timings = ""
+        if latencies:
+            p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+            timings = f", click-to-number median {statistics.median(latencies):.0f} ms, p95 {p95:.0f} ms"
+        app_logger.info(f"Call Now: {len(latencies)}/{counts['contact_clicks']} numbers revealed within {CONTACT_WAIT_MS} ms{timings}")
+    if counts["recycled_contexts"] or counts["recycled_browsers"]:
+        app_logger.info(f"Browser recycling: {counts['recycled_contexts']} contexts replaced, {counts['recycled_browsers']} browser restarts")
+
+
+def merge_counts(total: dict, counts: dict) -> dict:
+    total["http"] = total.get("http", 0) + counts["http"]
+    total["browser"] = total.get("browser", 0) + counts["browser"]
+    reasons = Counter(total.get("fallback_reasons", {}))
+    reasons.update(counts["fallback_reasons"])
+    total["fallback_reasons"] = dict(reasons)
+    total["contact_clicks"] = total.get("contact_clicks", 0) + counts["contact_clicks"]
+    total["contact_latencies_ms"] = total.get("contact_latencies_ms", []) + counts["contact_latencies_ms"]
+    total["recycled_contexts"] = total.get("recycled_contexts", 0) + counts["recycled_contexts"]
+    total["recycled_browsers"] = total.get("recycled_browsers", 0) + counts["recycled_browsers"]
+    return total
@@ -5,6 +5,42 @@
 INPUT_URL_FILE = "output/unique_doctor_urls.csv"
 OUTPUT_PROCESSED_FILE = "output/structured_doctor_data.json"
 OUTPUT_RAW_FILE = "output/raw_scraped_data.json"
+# JSON Lines, one record per line, appended as records complete
+RAW_JSONL_FILE = "output/test_contact_extraction.jsonl"
+PROCESSED_JSONL_FILE = "output/test_structured_doctor_data.jsonl"
+# Records written per fsync; a crash loses at most this many
+JSONL_FSYNC_BATCH = 50
+
+# --- URL Status Ledger ---
+# Status, attempts, last attempt and content hash per URL; reruns skip what already succeeded
+LEDGER_ENABLED = True
+LEDGER_PATH = "output/url_status.sqlite3"
+# Failed URLs are retried on later runs until they have been tried this many times
+MAX_URL_ATTEMPTS = 3
+# Ledger updates written per transaction
+LEDGER_BATCH = 50
+
+# --- Raw HTML Archive ---
+# Every fetched page, compressed and stored once per distinct content, indexed by URL and fetch time
+ARCHIVE_HTML = True
+HTML_ARCHIVE_DIR = "output/html_archive"
+
+# --- Profile Page Parsing ---
+# DOM backend ProfileScraper parses pages with: "lxml" (compiled XPath), "selectolax" or "bs4".
+# All three extract the same fields; bs4 is the reference and the slowest.
+PROFILE_PARSER_BACKEND = "lxml"
+# Hit/miss counts and lookup time of every ProfileScraper selector (see scrapers/profile_selectors.py),
+# written at the end of a run
+SELECTOR_STATS_FILE = "output/selector_stats.json"
+# Alternative selectors of a field are re-sorted by hit rate every this many lookups (0 = keep the declared order)
+SELECTOR_REORDER_INTERVAL = 50
+
+# --- Offline Re-extraction ---
+REEXTRACT_JSONL_FILE = "output/reextracted_raw_data.jsonl"
+# Processes; None means one per core
+REEXTRACT_WORKERS = None
+# Pages handed to a worker at a time
+REEXTRACT_CHUNK_SIZE = 8
 
 # --- Scraping Parameters ---
 # We can reuse some parameters from Module 1's config if needed,
@@ -13,6 +49,85 @@ RATE_LIMIT_SECONDS = 1.5
 MAX_RETRIES = 3
 BACKOFF_FACTOR = 0.5
 REQUEST_TIMEOUT = 25
+# Browser tabs scraping profiles at once; each tab is reused from URL to URL.
+# 0 opens one tab per URL, all at the same time.
+PAGE_WORKERS = 8
+# Worker processes for profile scraping, each with its own browser (1 = scrape in this process)
+EXTRACTOR_PROCESSES = 1
+# URLs handed to a worker process at a time; small chunks keep the processes evenly loaded
+SHARD_CHUNK_SIZE = 20
+# Raw records being processed (geocoded) at once
+PROCESS_CONCURRENCY = 8
+# Records waiting between pipeline stages (scrape -> process -> export); a full queue
+# pauses the stage feeding it, so a larger queue lets scraping run further ahead of
+# geocoding.
+PIPELINE_QUEUE_SIZE = 500
+
+# --- Browser Recycling ---
+# The browser context (cookies, cache, page state) is replaced after this many pages (0 = never)...
+CONTEXT_MAX_PAGES = 500
+# ...the browser itself after this many...
+BROWSER_MAX_PAGES = 5000
+# ...and first the context, then if needed the browser, once the browser uses more than this much memory (needs psutil; 0 = off)
+BROWSER_MAX_RSS_MB = 2000
+# Pages between memory samples; pages keep running while one is taken
+MEMORY_CHECK_PAGES = 100
+
+# --- "Call Now" Contact Reveal ---
+# How long a rendered profile is given to show the button; profiles without one wait this long
+CALL_BUTTON_WAIT_MS = 500
+# Upper bound on the wait for the number after the click, and how often the page is checked
+CONTACT_WAIT_MS = 3000
+CONTACT_POLL_MS = 100
+
+# --- Request Blocking ---
+# Abort the requests ProfileScraper does not need while profile pages render.
+# The page document and the "Call Now" XHR are never blocked by type.
+BLOCK_REQUESTS = True
+BLOCKED_RESOURCE_TYPES = ["image", "media", "font", "stylesheet"]
+# When non-empty, only these domains (and their subdomains) may load
+ALLOWED_DOMAINS = []
+# Ads, analytics and tracking
+BLOCKED_DOMAINS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "clarity.ms",
+    "newrelic.com",
+    "nr-data.net",
+    "moengage.com",
+    "branch.io",
+]
+# Pages first loaded with nothing blocked, to report bytes saved and latency gained (0 = skip)
+BLOCKING_BASELINE_PAGES = 3
+
+# --- Rate Limiting ---
+# Every request to the same host shares one token bucket.
+# rate = sustained requests per second, burst = requests allowed back-to-back after idling
+DEFAULT_HOST_RATE = 1 / RATE_LIMIT_SECONDS
+DEFAULT_HOST_BURST = 2
+HOST_RATE_LIMITS = {
+    # Nominatim usage policy: an absolute maximum of 1 request per second
+    "nominatim.openstreetmap.org": {"rate": 1.0, "burst": 1},
+    # Profile fetches over plain HTTP and browser navigations alike. One limit for the host, whatever the page:
+    # keep it equal to the one in url_scraper/utils/config.py
+    "www.practo.com": {"rate": 0.5, "burst": 3},
+}
+
+# --- HTTP-first Fetching ---
+# Fetch profiles over plain HTTP first and only render the ones that need it in the browser
+HTTP_FIRST = True
+# A profile fetched over HTTP is kept only if all of these fields were extracted
+REQUIRED_FIELDS = ["doctor_name", "specialty", "clinic_name", "address"]
+# Also send profiles to the browser when their number is only revealed by the "Call Now" button
+HTTP_REQUIRE_CONTACT = True
+HTTP_FETCH_CONCURRENCY = 16
+HTTP_MAX_CONNECTIONS = 20
 
 # --- Geolocation Validation ---
 # A bounding box for Pune city limits. We will check if a doctor's
@@ -1,14 +1,15 @@
 # data_extractor/utils/geo_validator.py
 
 import httpx
-import asyncio # Import asyncio
 from .config import PUNE_BOUNDING_BOX, REQUEST_TIMEOUT
+from .rate_limiter import rate_limiter
 from ..utils.logger import app_logger
 
 async def get_coordinates(address: str, client: httpx.AsyncClient) -> dict | None:
     """
     Uses the free Nominatim (OpenStreetMap) API to get coordinates for an address.
-    NOTE: This API has a strict usage policy (max 1 request/sec). A delay is added.
+    NOTE: This API has a strict usage policy (max 1 request/sec). All calls share
+    one token bucket for the Nominatim host, so concurrent lookups stay within it.
     """
     base_url = "https://nominatim.openstreetmap.org/search"
     params = {"q": address, "format": "json", "limit": 1}
@@ -16,7 +17,7 @@ async def get_coordinates(address: str, client: httpx.AsyncClient) -> dict | Non
 
     try:
         # --- KEY FIX: Respect the API's rate limit ---
-        await asyncio.sleep(1) 
+        await rate_limiter.acquire(base_url)
         
         response = await client.get(base_url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
@@ -0,0 +1,224 @@
+# data_extractor/utils/html_archive.py : Compressed, content-addressed store for every fetched profile page.
+
+import argparse
+import datetime
+import glob
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from .logger import app_logger
+
+try:
+    import zstandard
+except ImportError:   # optional; falls back to zlib
+    zstandard = None
+
+CODEC = "zstd" if zstandard else "zlib"
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 6
+
+
+def content_hash(html_content: str) -> str:
+    """Fingerprint of a fetched page; also its key in the archive."""
+    return hashlib.sha1(html_content.encode('utf-8')).hexdigest()
+
+
+def _compress(data: bytes) -> bytes:
+    if CODEC == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return zlib.compress(data, ZLIB_LEVEL)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("This page was archived with zstd; install the 'zstandard' package to read it.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class HtmlArchive:
+    """
+    Pages are stored once per distinct content: compressed (zstd when the
+    `zstandard` package is installed, zlib otherwise) and appended to a pack
+    file, keyed by the SHA-1 of the HTML. A SQLite index maps hash -> pack,
+    offset and length, and (url, fetch time) -> hash, so a page that did not
+    change between fetches costs one index row.
+
+    Each archive instance appends to a pack file of its own, so several
+    processes can share one archive directory; reads go through a memory map
+    of the pack. `put` is thread-safe and meant to run off the event loop.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pack_name = None
+        self._pack = None
+        self._maps: dict[str, tuple] = {}   # pack name -> (file, mmap)
+
+        self.conn = sqlite3.connect(os.path.join(directory, "index.sqlite3"), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        with self.conn:
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS blobs (
+                    hash     TEXT PRIMARY KEY,
+                    pack     TEXT NOT NULL,
+                    offset   INTEGER NOT NULL,
+                    length   INTEGER NOT NULL,
+                    raw_size INTEGER NOT NULL,
+                    codec    TEXT NOT NULL
+                ) WITHOUT ROWID"""
+            )
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS fetches (
+                    url        TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    hash       TEXT NOT NULL
+                )"""
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS fetches_url ON fetches (url, fetched_at)")
+
+    def _open_pack(self):
+        # Unique per writer, so concurrent processes never append to the same file
+        self._pack_name = f"pages-{time.strftime('%Y%m%d_%H%M%S')}-{os.getpid()}.pack"
+        self._pack = open(os.path.join(self.directory, self._pack_name), "ab")
+
+    def put(self, url: str, html_content: str, fetched_at: float | None = None) -> str:
+        """Archives one fetch of `url` and returns the page's content hash."""
+        data = html_content.encode('utf-8')
+        page_hash = hashlib.sha1(data).hexdigest()
+        with self._lock:
+            known = self.conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (page_hash,)).fetchone()
+            with self.conn:
+                if not known:
+                    if self._pack is None:
+                        self._open_pack()
+                    compressed = _compress(data)
+                    offset = self._pack.tell()
+                    self._pack.write(compressed)
+                    self._pack.flush()
+                    os.fsync(self._pack.fileno())
+                    # The bytes are on disk before the index points at them
+                    self.conn.execute(
+                        "INSERT OR IGNORE INTO blobs (hash, pack, offset, length, raw_size, codec) VALUES (?, ?, ?, ?, ?, ?)",
+                        (page_hash, self._pack_name, offset, len(compressed), len(data), CODEC),
+                    )
+                self.conn.execute(
+                    "INSERT INTO fetches (url, fetched_at, hash) VALUES (?, ?, ?)",
+                    (url, fetched_at or time.time(), page_hash),
+                )
+        return page_hash
+
+    def _view(self, pack: str, end: int):
+        entry = self._maps.get(pack)
+        if entry is None or len(entry[1]) < end:
+            # The pack has grown since it was mapped
+            if entry:
+                entry[1].close()
+                entry[0].close()
+            f = open(os.path.join(self.directory, pack), "rb")
+            entry = (f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            self._maps[pack] = entry
+        return entry[1]
+
+    def get(self, page_hash: str) -> str | None:
+        """The HTML stored under `page_hash`, or None."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT pack, offset, length, codec FROM blobs WHERE hash = ?", (page_hash,)
+            ).fetchone()
+            if row is None:
+                return None
+            pack, offset, length, codec = row
+            data = self._view(pack, offset + length)[offset:offset + length]
+        return _decompress(data, codec).decode('utf-8')
+
+    def history(self, url: str) -> list[tuple[float, str]]:
+        """(fetch time, content hash) for every archived fetch of `url`, oldest first."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT fetched_at, hash FROM fetches WHERE url = ? ORDER BY fetched_at", (url,)
+            ).fetchall()
+
+    def latest(self, url: str) -> str | None:
+        """The HTML of the most recent fetch of `url`, or None."""
+        fetches = self.history(url)
+        return self.get(fetches[-1][1]) if fetches else None
+
+    def latest_fetches(self) -> list[tuple[str, str]]:
+        """(url, content hash) of the most recent fetch of every archived URL."""
+        with self._lock:
+            return self.conn.execute(
+                """SELECT url, hash FROM fetches f
+                   WHERE fetched_at = (SELECT MAX(fetched_at) FROM fetches WHERE url = f.url)
+                   GROUP BY url ORDER BY url"""
+            ).fetchall()
+
+    def stats(self) -> dict:
+        with self._lock:
+            fetches, urls = self.conn.execute("SELECT COUNT(*), COUNT(DISTINCT url) FROM fetches").fetchone()
+            blobs, raw_size, stored = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(length), 0) FROM blobs"
+            ).fetchone()
+        return {
+            "fetches": fetches,
+            "urls": urls,
+            "distinct_pages": blobs,
+            "raw_mb": round(raw_size / 1e6, 2),
+            "stored_mb": round(stored / 1e6, 2),
+            "ratio": round(raw_size / stored, 2) if stored else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._pack:
+                self._pack.close()
+                self._pack = None
+            for f, view in self._maps.values():
+                view.close()
+                f.close()
+            self._maps.clear()
+            self.conn.close()
+
+
+def import_debug_html(archive: HtmlArchive, directory: str) -> int:
+    """
+    Archives the `profile_debug_<timestamp>.html` files saved by
+    ProfileScraper. Their URL was never recorded, so each is indexed under
+    its file path, with the timestamp from its name as the fetch time.
+    Files imported before are skipped.
+    """
+    count = 0
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        if archive.history(f"file:{path}"):
+            continue
+        name = os.path.basename(path)
+        try:
+            fetched_at = datetime.datetime.strptime(name, "profile_debug_%Y%m%d_%H%M%S.html").timestamp()
+        except ValueError:
+            fetched_at = os.path.getmtime(path)
+        with open(path, "r", encoding="utf-8") as f:
+            archive.put(f"file:{path}", f.read(), fetched_at)
+        count += 1
+    return count
+
+
+if __name__ == "__main__":
+    from .config import HTML_ARCHIVE_DIR
+
+    parser = argparse.ArgumentParser(description="Inspect or fill the raw HTML archive.")
+    parser.add_argument("--import-dir", help="Archive the .html files of this directory (e.g. debug_html)")
+    args = parser.parse_args()
+
+    archive = HtmlArchive(HTML_ARCHIVE_DIR)
+    if args.import_dir:
+        app_logger.info(f"Archived {import_debug_html(archive, args.import_dir)} files from {args.import_dir}")
+    app_logger.info(f"HTML archive {HTML_ARCHIVE_DIR}: {archive.stats()}")
+    archive.close()
@@ -0,0 +1,60 @@
+# data_extractor/utils/jsonl.py : Append-only JSON Lines files, written in fsync'ed batches and read back as streams.
+
+import json
+import os
+
+from .logger import app_logger
+
+
+class JsonlWriter:
+    """
+    Writes one JSON record per line. Records are buffered and written in
+    batches, each batch flushed and fsync'ed, so a crash loses at most one
+    batch. With `resume=True` an existing file is extended instead of replaced.
+    """
+
+    def __init__(self, path: str, batch_size: int, resume: bool = False):
+        self.path = path
+        self.batch_size = batch_size
+        self.written = 0
+        self._buffer: list[str] = []
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+
+    def write(self, record: dict):
+        self._buffer.append(json.dumps(record, ensure_ascii=False))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        self._file.write("".join(line + "\n" for line in self._buffer))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.written += len(self._buffer)
+        self._buffer.clear()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_jsonl(path: str):
+    """Yields the records of a JSON Lines file one at a time, skipping a torn last line."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # Only an interrupted final write can leave a partial line.
+                app_logger.warning(f"Skipping unreadable line {line_number} of {path}")
@@ -0,0 +1,116 @@
+# data_extractor/utils/status_ledger.py : Per-URL scrape status kept across runs, for skip-and-resume.
+
+import os
+import sqlite3
+import time
+
+from .logger import app_logger
+
+SUCCESS_STATUS = "scraped"
+
+
+class StatusLedger:
+    """
+    SQLite ledger of URL -> status, attempts, last attempt time, content hash
+    and whether the scraped record has been processed. A rerun scrapes only
+    URLs that have not succeeded yet and still have attempts left, and
+    processes only records that were not processed before.
+
+    The whole ledger is held in memory (a few hundred bytes per URL); changes
+    are written in one transaction per `batch_size` updates. Callers flush
+    their own output first, so the ledger never runs ahead of it.
+    """
+
+    def __init__(self, path: str, max_attempts: int, batch_size: int):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.batch_size = batch_size
+        self._rows: dict[str, list] = {}   # url -> [status, attempts, last_attempt, content_hash, processed]
+        self._dirty: set[str] = set()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS url_status (
+                url          TEXT PRIMARY KEY,
+                status       TEXT NOT NULL,
+                attempts     INTEGER NOT NULL,
+                last_attempt REAL NOT NULL,
+                content_hash TEXT,
+                processed    INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID"""
+        )
+        for url, *row in self.conn.execute(
+            "SELECT url, status, attempts, last_attempt, content_hash, processed FROM url_status"
+        ):
+            self._rows[url] = row
+
+    def _is_done(self, row: list) -> bool:
+        return row[0] == SUCCESS_STATUS or row[1] >= self.max_attempts
+
+    def pending(self, urls: list[str]) -> list[str]:
+        """The URLs still to scrape: never tried, or failed with attempts left."""
+        return [url for url in urls if url not in self._rows or not self._is_done(self._rows[url])]
+
+    def record(self, url: str, status: str, content_hash: str | None = None):
+        row = self._rows.get(url)
+        attempts = row[1] + 1 if row else 1
+        self._rows[url] = [status, attempts, time.time(), content_hash or (row[3] if row else None), 0]
+        self._dirty.add(url)
+
+    def is_processed(self, url: str) -> bool:
+        row = self._rows.get(url)
+        return bool(row and row[4])
+
+    def mark_processed(self, url: str):
+        row = self._rows.get(url)
+        if row:
+            row[4] = 1
+            self._dirty.add(url)
+
+    @property
+    def scraped(self) -> int:
+        return sum(1 for row in self._rows.values() if row[0] == SUCCESS_STATUS)
+
+    @property
+    def unprocessed(self) -> int:
+        return sum(1 for row in self._rows.values() if row[0] == SUCCESS_STATUS and not row[4])
+
+    def should_flush(self) -> bool:
+        return len(self._dirty) >= self.batch_size
+
+    def flush(self):
+        if not self._dirty:
+            return
+        with self.conn:
+            self.conn.executemany(
+                """INSERT OR REPLACE INTO url_status (url, status, attempts, last_attempt, content_hash, processed)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                [(url, *self._rows[url]) for url in self._dirty],
+            )
+        self._dirty.clear()
+
+    def progress(self, urls: list[str] | None = None) -> dict[str, int]:
+        """Counts per status (plus 'new' and 'gave_up'), over `urls` or the whole ledger."""
+        counts: dict[str, int] = {}
+        for url in urls if urls is not None else self._rows:
+            row = self._rows.get(url)
+            if row is None:
+                key = "new"
+            elif row[0] != SUCCESS_STATUS and row[1] >= self.max_attempts:
+                key = "gave_up"
+            else:
+                key = row[0]
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def log_progress(self, urls: list[str] | None = None):
+        counts = self.progress(urls)
+        total = sum(counts.values())
+        done = counts.get(SUCCESS_STATUS, 0)
+        app_logger.info(f"URL ledger: {done}/{total} scraped ({done / max(total, 1):.0%}) | {counts}")
+
+    def close(self):
+        self.flush()
+        self.conn.close()
@@ -0,0 +1,43 @@
+# bench_listing_parsers.py : Micro-benchmark of the listing-page parser backends on saved HTML.
+#
+# Usage (from the url_scraper directory):
+#   python bench_listing_parsers.py [page.html ...]      # defaults to debug_page.html
+
+import sys
+import time
+
+from scrapers.listing_parsers import PARSER_BACKENDS, HTMLParser
+
+ROUNDS = 20
+
+
+def main():
+    paths = sys.argv[1:] or ["debug_page.html"]
+    pages = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append(f.read())
+    print(f"{len(pages)} page(s), {sum(len(p) for p in pages) / 1024:.0f} KB, {ROUNDS} rounds\n")
+
+    reference = [set(PARSER_BACKENDS["bs4"](page)) for page in pages]
+    timings = {}
+    for name, parse in PARSER_BACKENDS.items():
+        if name == "selectolax" and HTMLParser is None:
+            print(f"{name:<12} skipped (not installed)")
+            continue
+
+        mismatches = sum(set(parse(page)) != expected for page, expected in zip(pages, reference))
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            for page in pages:
+                parse(page)
+        per_page = (time.perf_counter() - start) / (ROUNDS * len(pages))
+        timings[name] = per_page
+
+        speedup = timings["bs4"] / per_page
+        status = "identical links" if not mismatches else f"{mismatches} page(s) DIFFER from bs4"
+        print(f"{name:<12} {per_page * 1000:8.2f} ms/page  {speedup:5.1f}x vs bs4  ({status})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,70 +1,155 @@
 # main.py
 
+import argparse
 import asyncio
-import pandas as pd
-from tqdm.asyncio import tqdm
 import time
 
-from scrapers.practo_scraper import PractoScraper
-from scrapers.justdial_scraper import JustdialScraper
-from utils.config import BASE_URLS, SPECIALTIES, OUTPUT_FILE_PATH
+from scheduler import CrawlJob, CrawlScheduler
+from scrapers.listing_parsers import shutdown_parser_pool
+from scrapers.registry import SCRAPER_CLASSES, build_scraper
+from sharding import merge_shard_outputs, run_local_workers, run_shard_worker, seed_shards
+from utils.config import (
+    SPECIALTIES,
+    OUTPUT_FILE_PATH,
+    DELTA_OUTPUT_FILE_PATH,
+    OUTPUT_FLUSH_BATCH,
+    RESUME_OUTPUT,
+    TARGET_CITIES,
+    INCREMENTAL_MODE,
+    PROXY_LIST,
+    SHARD_WORKERS,
+    CHECKPOINT_ENABLED,
+    CHECKPOINT_PATH,
+    CHECKPOINT_BATCH,
+)
+from utils.http_cache import response_cache
+from utils.frontier import CrawlFrontier
 from utils.logger import app_logger
+from utils.rate_limiter import rate_limiter
+from utils.url_sink import UrlSink
 
-async def main():
+async def main(resume: bool = RESUME_OUTPUT):
     """
     Main orchestration function to run the scraping process.
+    With `resume`, continues the frontier and output of an interrupted run.
     """
     start_time = time.time()
     app_logger.info("--- Starting URL Scraping Agent ---")
     
-    # Initialize all scrapers
-    scrapers = [
-        PractoScraper(BASE_URLS["practo"]),
-        JustdialScraper(BASE_URLS["justdial"]),
-        # Add other scraper instances here as they are built
-    ]
-    
-    # Create a list of all scraping tasks to run concurrently
-    tasks = []
-    for scraper in scrapers:
-        for specialty in SPECIALTIES:
-            tasks.append(scraper.scrape(specialty))
+    # URLs are deduplicated and appended to the output file as they are found.
+    # Incremental runs extend the previous output and also write the new URLs to a delta file.
+    sink = UrlSink(
+        OUTPUT_FILE_PATH,
+        batch_size=OUTPUT_FLUSH_BATCH,
+        resume=INCREMENTAL_MODE or resume,
+        delta_path=DELTA_OUTPUT_FILE_PATH if INCREMENTAL_MODE else None,
+    )
+    known_urls = None
+    if INCREMENTAL_MODE:
+        if sink.loaded:
+            known_urls = sink
+            app_logger.info(f"Incremental mode: {sink.loaded} URLs known from earlier runs")
+        else:
+            app_logger.warning(f"Incremental mode: no previous output at {OUTPUT_FILE_PATH}. Running a full crawl.")
 
-    # Run tasks concurrently with a progress bar
-    all_found_urls = []
-    results = await tqdm.gather(*tasks, desc="Scraping All Specialties")
+    # Initialize all scrapers, keyed by (source, city)
+    scrapers = {
+        (source, city): build_scraper(source, city, known_urls)
+        for source in SCRAPER_CLASSES
+        for city in TARGET_CITIES
+    }
     
-    for url_list in results:
-        all_found_urls.extend(url_list)
-
-    # --- Data Deduplication and Saving ---
-    if not all_found_urls:
-        app_logger.warning("No URLs were found. Exiting.")
-        return
+    # Seed the scheduler with the first listing page of every specialty;
+    # later pages are queued as earlier ones come back.
+    # Checkpointed frontier: jobs an interrupted run had not finished are queued
+    # again, and seeds it already knows about are skipped.
+    frontier = CrawlFrontier(CHECKPOINT_PATH, CHECKPOINT_BATCH, resume=resume) if CHECKPOINT_ENABLED else None
+    scheduler = CrawlScheduler(scrapers, sink, frontier=frontier)
+    if frontier:
+        unfinished = frontier.unfinished()
+        for key in unfinished:
+            scheduler.requeue(CrawlJob(*key))
+        if resume:
+            app_logger.info(f"Resuming {len(unfinished)} unfinished listing pages.")
+    for source, city in scrapers:
+        for specialty in SPECIALTIES:
+            scheduler.submit(CrawlJob(source, city, specialty, 1))
 
-    app_logger.info(f"Total URLs found before deduplication: {len(all_found_urls)}")
-    
-    # Use pandas for efficient deduplication
-    df = pd.DataFrame(all_found_urls, columns=['url'])
-    df.drop_duplicates(inplace=True)
-    
-    unique_urls_count = len(df)
-    app_logger.info(f"Total unique URLs after deduplication: {unique_urls_count}")
-    
-    # Save the unique URLs to a CSV file
     try:
-        df.to_csv(OUTPUT_FILE_PATH, index=False)
-        app_logger.success(f"Successfully saved {unique_urls_count} unique URLs to {OUTPUT_FILE_PATH}")
-    except Exception as e:
-        app_logger.error(f"Failed to save URLs to file: {e}")
+        await scheduler.run()
+    finally:
+        sink.close()
+        if frontier:
+            frontier.close()
+
+    if not len(sink):
+        app_logger.warning("No URLs were found.")
+    else:
+        app_logger.success(f"Saved {len(sink)} unique URLs to {OUTPUT_FILE_PATH} ({sink.added} new in this run)")
+        if INCREMENTAL_MODE:
+            app_logger.success(f"Saved {sink.added} new URLs to {DELTA_OUTPUT_FILE_PATH}")
 
     # Gracefully close all scraper sessions
-    for scraper in scrapers:
+    for (source, city), scraper in scrapers.items():
+        if PROXY_LIST:
+            for stats in scraper.proxy_pool.stats():
+                app_logger.info(f"Proxy [{source}/{city}] {stats['proxy']}: {stats['requests']} requests, {stats['failures']} failures, latency {stats['latency_seconds']}s, error rate {stats['error_rate']}")
         await scraper.close_session()
+    shutdown_parser_pool()
+
+    for host, stats in rate_limiter.stats().items():
+        app_logger.info(f"Rate limiter [{host}]: {stats['tokens_granted']} requests, waited {stats['total_wait_seconds']}s in total (max {stats['max_wait_seconds']}s)")
+
+    if response_cache:
+        stats = response_cache.stats()
+        app_logger.info(f"Response cache: {stats['hits']} hits, {stats['misses']} misses, {stats['revalidated']} revalidated (304), {stats['changed']} changed, {stats['evicted']} evicted, {stats['size_mb']} MB on disk")
+        response_cache.close()
 
     end_time = time.time()
     app_logger.info(f"--- URL Scraping Agent Finished in {end_time - start_time:.2f} seconds ---")
 
 
+def run_sharded(args):
+    """Splits the crawl into (source, city, specialty) shards worked on by several processes."""
+    start_time = time.time()
+    app_logger.info("--- Starting sharded URL Scraping Agent ---")
+
+    if not args.merge_only:
+        seed_shards(reset=args.reset_shards)
+        if args.shard_worker:
+            # Join a crawl that is coordinated elsewhere; the coordinator merges.
+            rate_limiter.scale(1 / args.total_workers)
+            asyncio.run(run_shard_worker())
+            return
+        run_local_workers(args.workers)
+
+    merge_shard_outputs()
+    app_logger.info(f"--- Sharded URL Scraping Agent Finished in {time.time() - start_time:.2f} seconds ---")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Collects doctor profile URLs from listing pages.")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted crawl from its checkpoint and output file")
+    parser.add_argument("--sharded", action="store_true",
+                        help="split the crawl into (source, city, specialty) shards run by worker processes")
+    parser.add_argument("--workers", type=int, default=SHARD_WORKERS,
+                        help=f"local worker processes for --sharded (default {SHARD_WORKERS})")
+    parser.add_argument("--shard-worker", action="store_true",
+                        help="join a sharded crawl as a single worker (e.g. from another machine)")
+    parser.add_argument("--total-workers", type=int, default=1,
+                        help="with --shard-worker: workers crawling at once on all machines; the per-host "
+                             "rate limits are a budget they share, so this worker gets 1/N of it (default 1)")
+    parser.add_argument("--merge-only", action="store_true",
+                        help="only merge the finished shard files into the output file")
+    parser.add_argument("--reset-shards", action="store_true",
+                        help="forget the previous sharded crawl and start over")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    args = parse_args()
+    if args.sharded or args.shard_worker or args.merge_only:
+        run_sharded(args)
+    else:
+        asyncio.run(main(resume=args.resume or RESUME_OUTPUT))
\ No newline at end of file
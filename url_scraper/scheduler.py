@@ -0,0 +1,259 @@
+# scheduler.py : Bounded work-queue scheduler that feeds listing-page jobs to the scrapers.
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import astuple, dataclass, replace
+
+from scrapers.base_scraper import BaseScraper
+from utils.frontier import CrawlFrontier, DONE, FAILED, IN_FLIGHT
+from utils.url_sink import UrlSink
+from utils.config import (
+    GLOBAL_WORKER_LIMIT,
+    SOURCE_WORKER_LIMITS,
+    SCHEDULER_REPORT_INTERVAL,
+    INCREMENTAL_STOP_AFTER,
+    PAGINATION_WINDOW,
+)
+from utils.logger import app_logger
+
+
+@dataclass(frozen=True)
+class CrawlJob:
+    """One listing page to fetch."""
+    source: str
+    city: str
+    specialty: str
+    page: int
+
+    @property
+    def lane(self) -> tuple[str, str, str]:
+        """Jobs of the same (source, city, specialty) share a lane."""
+        return (self.source, self.city, self.specialty)
+
+
+@dataclass
+class WorkerStats:
+    pages: int = 0
+    urls: int = 0
+    busy_seconds: float = 0.0
+
+
+class FairJobQueue:
+    """
+    asyncio queue that hands jobs out round-robin across lanes, so a specialty
+    with many pages cannot starve the others.
+    """
+
+    def __init__(self):
+        self._lanes: dict[tuple, deque[CrawlJob]] = {}
+        self._rotation: deque[tuple] = deque()
+        # One ticket per queued job; gives us blocking get() and join() for free.
+        self._tickets = asyncio.Queue()
+
+    def put(self, job: CrawlJob):
+        lane = self._lanes.get(job.lane)
+        if lane is None:
+            lane = self._lanes[job.lane] = deque()
+            self._rotation.append(job.lane)
+        lane.append(job)
+        self._tickets.put_nowait(None)
+
+    async def get(self) -> CrawlJob:
+        await self._tickets.get()
+        key = self._rotation.popleft()
+        lane = self._lanes[key]
+        job = lane.popleft()
+        if lane:
+            self._rotation.append(key)
+        else:
+            del self._lanes[key]
+        return job
+
+    def task_done(self):
+        self._tickets.task_done()
+
+    async def join(self):
+        await self._tickets.join()
+
+    def qsize(self) -> int:
+        return self._tickets.qsize()
+
+
+class CrawlScheduler:
+    """
+    Runs CrawlJobs with a fixed number of workers per source and a global cap on
+    requests in flight. Each finished page schedules the pages that follow it:
+    all remaining pages at once when the first page reports a total, otherwise
+    enough to keep PAGINATION_WINDOW pages of the lane queued ahead. The first
+    page that comes back empty ends the lane; pages queued past it are not
+    fetched and results of ones already in flight are ignored. When the
+    scraper knows URLs from an earlier run, lanes advance one page at a time
+    and stop after INCREMENTAL_STOP_AFTER pages in a row without a new URL.
+    Found URLs go straight to `sink`.
+    `scrapers` is keyed by (source, city); worker limits apply per source.
+
+    With a `frontier`, every job's status is checkpointed and jobs already
+    known to it are not queued again. The sink is flushed before each
+    checkpoint, so a page is never marked done ahead of its URLs.
+    """
+
+    def __init__(self, scrapers: dict[tuple[str, str], BaseScraper], sink: UrlSink,
+                 source_limits: dict[str, int] = SOURCE_WORKER_LIMITS,
+                 global_limit: int = GLOBAL_WORKER_LIMIT,
+                 frontier: CrawlFrontier | None = None):
+        self.scrapers = scrapers
+        self.source_limits = source_limits
+        self.global_limit = global_limit
+        self.queues = {source: FairJobQueue() for source, _ in scrapers}
+        self.lane_bounds: dict[tuple, int] = {}
+        self.lane_ends: dict[tuple, int] = {}     # first empty page of a lane
+        self.lane_queued: dict[tuple, int] = {}   # last page submitted for a lane without a bound
+        self.stale_runs: dict[tuple, int] = {}
+        self.sink = sink
+        self.frontier = frontier
+        self.worker_stats: dict[str, WorkerStats] = {}
+        self.in_flight = 0
+        self.started_at = None
+
+    def submit(self, job: CrawlJob):
+        if self.frontier and not self.frontier.add(astuple(job)):
+            return
+        self.queues[job.source].put(job)
+
+    def requeue(self, job: CrawlJob):
+        """Queues a job the frontier already knows about (resuming a run)."""
+        self.queues[job.source].put(job)
+
+    def _checkpoint(self, job: CrawlJob, status: str):
+        if not self.frontier:
+            return
+        self.frontier.mark(astuple(job), status)
+        if self.frontier.should_flush():
+            self.sink.flush()
+            self.frontier.flush()
+
+    def _schedule_followups(self, job: CrawlJob, total_pages: int | None, new_links: int):
+        if self.scrapers[(job.source, job.city)].known_urls:
+            stale_run = 0 if new_links else self.stale_runs.get(job.lane, 0) + 1
+            self.stale_runs[job.lane] = stale_run
+            if stale_run >= INCREMENTAL_STOP_AFTER:
+                app_logger.info(f"[Scheduler] {stale_run} pages in a row with no new URLs for {job.specialty} ({job.city}). Lane finished at page {job.page}.")
+            else:
+                self.submit(replace(job, page=job.page + 1))
+            return
+
+        bound = self.lane_bounds.get(job.lane)
+        if job.page == 1 and total_pages:
+            self.lane_bounds[job.lane] = bound = total_pages
+            for page in range(2, total_pages + 1):
+                self.submit(replace(job, page=page))
+        if bound is None:
+            # Without a known total keep a window of pages ahead, never past the end once it is known
+            last = job.page + max(1, PAGINATION_WINDOW)
+            if job.lane in self.lane_ends:
+                last = min(last, self.lane_ends[job.lane] - 1)
+            for page in range(max(job.page, self.lane_queued.get(job.lane, 0)) + 1, last + 1):
+                self.submit(replace(job, page=page))
+            self.lane_queued[job.lane] = max(self.lane_queued.get(job.lane, 0), last)
+        elif job.page >= bound:
+            # Past the known total, in case it was stale, probe one page ahead
+            self.submit(replace(job, page=job.page + 1))
+
+    def _past_end(self, job: CrawlJob) -> bool:
+        end = self.lane_ends.get(job.lane)
+        return end is not None and job.page > end
+
+    async def _worker(self, name: str, source: str, global_slots: asyncio.Semaphore):
+        queue = self.queues[source]
+        stats = self.worker_stats[name]
+
+        while True:
+            job = await queue.get()
+            status = FAILED
+            try:
+                if self._past_end(job):
+                    # Queued ahead before the lane turned out to end earlier
+                    status = DONE
+                    continue
+                self._checkpoint(job, IN_FLIGHT)
+                async with global_slots:
+                    self.in_flight += 1
+                    started = time.monotonic()
+                    try:
+                        scraper = self.scrapers[(job.source, job.city)]
+                        result = await scraper.scrape_page(job.specialty, job.page)
+                    finally:
+                        self.in_flight -= 1
+                        stats.busy_seconds += time.monotonic() - started
+                stats.pages += 1
+
+                if result is None:
+                    # Stays FAILED, so --resume fetches the page again
+                    app_logger.warning(f"[{name}] Page {job.page} of {job.specialty} ({job.city}) could not be fetched; left for --resume.")
+                    continue
+                if not result[0]:
+                    status = DONE
+                    if not self._past_end(job):
+                        self.lane_ends[job.lane] = job.page
+                        app_logger.info(f"[{name}] No more profiles for {job.specialty} ({job.city}) on page {job.page}. Lane finished.")
+                    continue
+                if self._past_end(job):
+                    status = DONE
+                    continue
+
+                links, total_pages = result
+                stats.urls += len(links)
+                new_links = self.sink.add(links)
+                self._schedule_followups(job, total_pages, new_links)
+                status = DONE
+            except Exception as e:
+                app_logger.error(f"[{name}] Job {job} failed: {e}")
+            finally:
+                self._checkpoint(job, status)
+                queue.task_done()
+
+    def log_progress(self):
+        """Logs queue depth per source and throughput per worker."""
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        depth = ", ".join(f"{source}={queue.qsize()}" for source, queue in self.queues.items())
+        pages_done = sum(stats.pages for stats in self.worker_stats.values())
+        app_logger.info(
+            f"[Scheduler] Queue depth: {depth} | in flight: {self.in_flight}/{self.global_limit} | "
+            f"pages done: {pages_done} ({pages_done / elapsed:.2f}/s) | unique URLs: {len(self.sink)}"
+        )
+        throughput = ", ".join(
+            f"{name}: {stats.pages}p {stats.pages / elapsed:.2f}/s" for name, stats in self.worker_stats.items()
+        )
+        app_logger.info(f"[Scheduler] Workers: {throughput}")
+
+    async def _report_progress(self):
+        while True:
+            await asyncio.sleep(SCHEDULER_REPORT_INTERVAL)
+            self.log_progress()
+
+    async def run(self):
+        """Runs until every queue is drained."""
+        self.started_at = time.monotonic()
+        global_slots = asyncio.Semaphore(self.global_limit)
+
+        workers = []
+        for source in self.queues:
+            for i in range(self.source_limits.get(source, 1)):
+                name = f"{source}-{i}"
+                self.worker_stats[name] = WorkerStats()
+                workers.append(asyncio.create_task(self._worker(name, source, global_slots)))
+        reporter = asyncio.create_task(self._report_progress())
+
+        try:
+            await asyncio.gather(*(queue.join() for queue in self.queues.values()))
+        finally:
+            # Also when run() itself is cancelled, so no worker outlives it
+            for task in workers + [reporter]:
+                task.cancel()
+            await asyncio.gather(*workers, reporter, return_exceptions=True)
+
+        self.sink.flush()
+        if self.frontier:
+            self.frontier.flush()
+        self.log_progress()
@@ -3,7 +3,8 @@
 
 import asyncio
 import random
-from abc import ABC, abstractmethod
+import time
+from abc import ABC
 import httpx
 from bs4 import BeautifulSoup
 
@@ -11,34 +12,29 @@ from utils.config import (
     RATE_LIMIT_SECONDS,
     MAX_RETRIES,
     BACKOFF_FACTOR,
-    REQUEST_TIMEOUT,
     USER_AGENTS,
     PROXY_LIST,
+    PROXY_BAN_STATUS_CODES,
 )
+from utils.http_cache import response_cache
 from utils.logger import app_logger
+from utils.proxy_pool import ProxyPool
+from utils.rate_limiter import rate_limiter
 
 class BaseScraper(ABC):
     """
     Abstract base class for all scrapers. It provides a robust infrastructure for
     making HTTP requests with sessions, retries, proxy/user-agent rotation,
-    and rate limiting.
+    and per-host rate limiting shared across all scrapers.
     """
 
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, known_urls=None):
         self.base_url = base_url
-        self.client = httpx.AsyncClient(
-            proxy=self._get_proxy(),
-            timeout=REQUEST_TIMEOUT,
-            follow_redirects=True,
-            http2=True  # Enable HTTP/2 for better performance on modern servers
-        )
-
-    def _get_proxy(self) -> dict | None:
-        """Selects a random proxy if available."""
-        if not PROXY_LIST:
-            return None
-        proxy = random.choice(PROXY_LIST)
-        return {"http://": proxy, "https://": proxy}
+        # URLs discovered by earlier runs (incremental mode); empty for a full crawl.
+        # Any container works, e.g. a set or the UrlSink being written to.
+        self.known_urls = known_urls if known_urls is not None else set()
+        # One httpx client per proxy; each request picks the healthiest one
+        self.proxy_pool = ProxyPool(PROXY_LIST)
 
     def _get_headers(self) -> dict:
         """Returns headers with a random user-agent."""
@@ -47,12 +43,35 @@ class BaseScraper(ABC):
     async def fetch(self, url: str) -> httpx.Response | None:
         """
         Performs an asynchronous GET request with error handling and retries.
+        When the response cache is enabled, cached pages are revalidated with a
+        conditional GET and a 304 is answered from the cache.
         """
+        headers = self._get_headers()
+        cached = None
+        if response_cache:
+            cached = response_cache.get(url, headers)
+            if response_cache.cache_only:
+                return response_cache.replay(cached, url)
+            if cached:
+                headers.update(response_cache.validators(cached))
+
         for attempt in range(MAX_RETRIES):
+            proxy = self.proxy_pool.choose()
             try:
-                await asyncio.sleep(RATE_LIMIT_SECONDS) # Rate limiting
-                response = await self.client.get(url, headers=self._get_headers())
+                await rate_limiter.acquire(url) # Shared per-host rate limiting
+                started = time.monotonic()
+                try:
+                    response = await proxy.client.get(url, headers=headers)
+                except httpx.RequestError:
+                    self.proxy_pool.report(proxy, time.monotonic() - started, ok=False)
+                    raise
+                proxy_ok = response.status_code < 500 and response.status_code not in PROXY_BAN_STATUS_CODES
+                self.proxy_pool.report(proxy, time.monotonic() - started, ok=proxy_ok)
+                if cached and response.status_code == 304:
+                    return response_cache.not_modified(cached, url)
                 response.raise_for_status() # Raise exception for 4xx/5xx responses
+                if response_cache:
+                    response_cache.store(url, headers, response, had_entry=cached is not None)
                 return response
             
             except (httpx.RequestError, httpx.HTTPStatusError) as e:
@@ -66,15 +85,23 @@ class BaseScraper(ABC):
                 await asyncio.sleep(backoff_delay)
         return None
 
-    @abstractmethod
     async def scrape(self, specialty: str) -> list[str]:
         """
-        Abstract method to be implemented by each specific scraper.
+        To be implemented by scrapers without page-level support (see scrape_page).
         It should orchestrate the scraping process for a given specialty
         and return a list of doctor profile URLs.
         """
-        pass
+        raise NotImplementedError(f"{type(self).__name__} implements neither scrape() nor scrape_page()")
+
+    async def scrape_page(self, specialty: str, page: int) -> tuple[list[str], int | None] | None:
+        """
+        Scrapes a single listing page and returns (profile_links, total_pages).
+        Scrapers without page-level support do the whole specialty as page 1.
+        """
+        if page != 1:
+            return [], None
+        return await self.scrape(specialty), 1
 
     async def close_session(self):
-        """Closes the httpx client session."""
-        await self.client.aclose()
\ No newline at end of file
+        """Closes the httpx client sessions of every proxy."""
+        await self.proxy_pool.aclose()
\ No newline at end of file
@@ -11,8 +11,8 @@ class JustdialScraper(BaseScraper):
     This implementation is a basic attempt with httpx.
     """
 
-    def __init__(self, base_url: str):
-        super().__init__(base_url)
+    def __init__(self, base_url: str, known_urls=None):
+        super().__init__(base_url, known_urls)
         self.name = "Justdial"
     
     async def scrape(self, specialty: str) -> list[str]:
@@ -0,0 +1,142 @@
+# scrapers/listing_parsers.py : Interchangeable parser backends for Practo listing pages.
+#
+# Every backend returns the same set of profile links. Parsing is CPU-bound, so
+# parse_listing() runs it on a worker pool and keeps the event loop free for I/O.
+
+import asyncio
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # optional backend
+    HTMLParser = None
+
+from utils.config import LISTING_PARSER_BACKEND, PARSER_EXECUTOR, PARSER_WORKERS
+
+PRACTO_HOST = "https://www.practo.com"
+
+# Practo embeds the total number of matching doctors in the page state
+# ("doctors_found":80) and in the listing header ("80 Dermatologists available in Pune").
+RESULT_COUNT_PATTERNS = [
+    re.compile(r'"doctors_found"\s*:\s*(\d+)'),
+    re.compile(r'(\d+)\s+[A-Za-z-]+\s+available\s+in', re.I),
+]
+
+# Compiled once per process
+_XPATH_CARDS = etree.XPath("//div[contains(concat(' ', normalize-space(@class), ' '), ' info-section ')]")
+_XPATH_FIRST_LINK = etree.XPath("(.//a)[1]")
+_XPATH_DOCTOR_NAME = etree.XPath(".//h2[@data-qa-id='doctor_name']")
+
+
+def parse_links_bs4(html_content: str) -> list[str]:
+    """Reference implementation: full BeautifulSoup tree."""
+    soup = BeautifulSoup(html_content, 'lxml')
+    links = set()
+    
+    # This selector for the main container is correct.
+    doctor_cards = soup.find_all('div', class_='info-section')
+    
+    for card in doctor_cards:
+        # CORRECTED LOGIC: The <a> tag is a parent of the <h2>.
+        # We find the <a> tag first, then verify it contains the doctor name.
+        link_tag = card.find('a')
+        
+        if link_tag and 'href' in link_tag.attrs:
+            # This check ensures we only get the main profile link, not other random links.
+            if link_tag.find('h2', {'data-qa-id': 'doctor_name'}):
+                full_url = PRACTO_HOST + link_tag['href']
+                links.add(full_url)
+                
+    return list(links)
+
+
+def parse_links_lxml(html_content: str) -> list[str]:
+    """Raw lxml tree with precompiled XPath expressions."""
+    try:
+        tree = lxml_html.fromstring(html_content)
+    except etree.ParserError:  # nothing but whitespace or comments
+        return []
+    links = set()
+
+    for card in _XPATH_CARDS(tree):
+        first_link = _XPATH_FIRST_LINK(card)
+        if not first_link:
+            continue
+        href = first_link[0].get('href')
+        if href is not None and _XPATH_DOCTOR_NAME(first_link[0]):
+            links.add(PRACTO_HOST + href)
+
+    return list(links)
+
+
+def parse_links_selectolax(html_content: str) -> list[str]:
+    """selectolax (lexbor) tree with CSS selectors."""
+    if HTMLParser is None:
+        raise ImportError("LISTING_PARSER_BACKEND='selectolax' requires the selectolax package")
+    tree = HTMLParser(html_content)
+    links = set()
+
+    for card in tree.css('div.info-section'):
+        link_tag = card.css_first('a')
+        if link_tag is None:
+            continue
+        if 'href' in link_tag.attributes and link_tag.css_first("h2[data-qa-id='doctor_name']"):
+            links.add(PRACTO_HOST + (link_tag.attributes['href'] or ''))
+
+    return list(links)
+
+
+PARSER_BACKENDS = {
+    "bs4": parse_links_bs4,
+    "lxml": parse_links_lxml,
+    "selectolax": parse_links_selectolax,
+}
+
+
+def parse_result_count(html_content: str) -> int | None:
+    """Returns the total number of doctors the listing reports, if shown."""
+    for pattern in RESULT_COUNT_PATTERNS:
+        match = pattern.search(html_content)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def parse_listing_page(html_content: str, backend: str = LISTING_PARSER_BACKEND) -> tuple[list[str], int | None]:
+    """Returns (profile_links, reported_result_count). Safe to run in a worker process."""
+    if not html_content.strip():
+        return [], None
+    return PARSER_BACKENDS[backend](html_content), parse_result_count(html_content)
+
+
+_parser_pool: Executor | None = None
+
+
+def _get_parser_pool() -> Executor | None:
+    global _parser_pool
+    if _parser_pool is None and PARSER_WORKERS > 0:
+        if PARSER_EXECUTOR == "process":
+            _parser_pool = ProcessPoolExecutor(max_workers=PARSER_WORKERS)
+        else:
+            _parser_pool = ThreadPoolExecutor(max_workers=PARSER_WORKERS, thread_name_prefix="listing-parser")
+    return _parser_pool
+
+
+async def parse_listing(html_content: str) -> tuple[list[str], int | None]:
+    """Parses a listing page off the event loop (inline when PARSER_WORKERS is 0)."""
+    pool = _get_parser_pool()
+    if pool is None:
+        return parse_listing_page(html_content)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, parse_listing_page, html_content, LISTING_PARSER_BACKEND)
+
+
+def shutdown_parser_pool():
+    global _parser_pool
+    if _parser_pool is not None:
+        _parser_pool.shutdown()
+        _parser_pool = None
@@ -0,0 +1,20 @@
+# scrapers/registry.py : Builds the scraper for a (source, city) pair.
+
+from scrapers.base_scraper import BaseScraper
+from scrapers.practo_scraper import PractoScraper
+from scrapers.justdial_scraper import JustdialScraper
+from utils.config import BASE_URL_TEMPLATES
+
+SCRAPER_CLASSES = {
+    "practo": PractoScraper,
+    "justdial": JustdialScraper,
+    # Add other scraper classes here as they are built
+}
+
+
+def base_url_for(source: str, city: str) -> str:
+    return BASE_URL_TEMPLATES[source].format(city=city, city_title=city.capitalize())
+
+
+def build_scraper(source: str, city: str, known_urls=None) -> BaseScraper:
+    return SCRAPER_CLASSES[source](base_url_for(source, city), known_urls)
@@ -1,37 +1,31 @@
 # url_scraper/scrapers/selenium_base_scraper.py
 
-import asyncio
 from abc import ABC, abstractmethod
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 
+from .webdriver_pool import WebDriverPool
 # Corrected import path relative to the url_scraper directory
+from ..utils.config import SELENIUM_POOL_SIZE, DRIVER_MAX_PAGES, DRIVER_MAX_RSS_MB
 from ..utils.logger import app_logger
 
 class SeleniumBaseScraper(ABC):
     """
     Abstract base class for scrapers requiring JavaScript rendering.
-    It manages a Selenium WebDriver instance and fetches dynamic content
-    in a way that is compatible with an asyncio event loop.
+    It manages a bounded pool of Selenium WebDriver instances and fetches
+    dynamic content in a way that is compatible with an asyncio event loop.
+    Each concurrent fetch gets a driver of its own.
     """
 
     def __init__(self, base_url: str):
         self.base_url = base_url
-        
-        chrome_options = webdriver.ChromeOptions()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-        
-        self.driver = webdriver.Chrome(
-            service=ChromeService(ChromeDriverManager().install()),
-            options=chrome_options
-        )
-        app_logger.info("Selenium WebDriver initialized in headless mode.")
+        self.driver_pool = WebDriverPool(SELENIUM_POOL_SIZE, DRIVER_MAX_PAGES, DRIVER_MAX_RSS_MB)
+
+    async def warm_up(self):
+        """Starts all pooled drivers before the crawl begins."""
+        await self.driver_pool.start()
 
     """
     def _get_page_source_sync(self, url: str) -> str | None:
@@ -51,18 +45,18 @@ class SeleniumBaseScraper(ABC):
         """
     # ... (imports and other class methods are unchanged) ...
 
-    def _get_page_source_sync(self, url: str) -> str | None:
+    def _get_page_source_sync(self, driver: webdriver.Chrome, url: str) -> str | None:
         """
         [Synchronous] Helper method that performs the actual browser actions.
-        This function will be run in a separate thread to avoid blocking asyncio.
+        This function will be run on the pool's executor, with a driver checked out for it.
         """
         try:
-            self.driver.get(url)
+            driver.get(url)
             # Wait for up to 10 seconds for the main doctor card container to be visible.
-            WebDriverWait(self.driver, 10).until(
+            WebDriverWait(driver, 10).until(
                 EC.visibility_of_element_located((By.CSS_SELECTOR, "div.listing-doctor-card"))
             )
-            return self.driver.page_source
+            return driver.page_source
         except Exception as e:
             # This is now an INFO log, as a timeout is the expected way to find the last page.
             app_logger.info(f"Timeout waiting for doctor cards on {url}. Assuming this is the last page.")
@@ -73,18 +67,14 @@ class SeleniumBaseScraper(ABC):
 
     async def fetch_with_browser(self, url: str) -> str | None:
         """
-        [Asynchronous] Fetches a URL using the Selenium WebDriver by running it in a thread.
+        [Asynchronous] Fetches a URL with a pooled Selenium WebDriver on the pool's executor.
         """
-        loop = asyncio.get_running_loop()
-        html_content = await loop.run_in_executor(None, self._get_page_source_sync, url)
-        return html_content
+        return await self.driver_pool.run(self._get_page_source_sync, url)
 
     @abstractmethod
     async def scrape(self, specialty: str) -> list[dict]:
         pass
 
     def close_session(self):
-        """Closes the Selenium WebDriver session."""
-        if self.driver:
-            self.driver.quit()
-            app_logger.info("Selenium WebDriver session closed.")
\ No newline at end of file
+        """Closes every pooled Selenium WebDriver session."""
+        self.driver_pool.close()
\ No newline at end of file
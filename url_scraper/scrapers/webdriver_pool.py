@@ -0,0 +1,158 @@
+# url_scraper/scrapers/webdriver_pool.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from webdriver_manager.chrome import ChromeDriverManager
+
+try:
+    import psutil
+except ImportError:  # optional: only needed for memory-based recycling
+    psutil = None
+
+from ..utils.logger import app_logger
+
+CHROME_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+
+class PooledDriver:
+    """A WebDriver plus the number of pages it has served."""
+
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self.pages = 0
+
+
+class WebDriverPool:
+    """
+    A bounded pool of headless Chrome drivers. Each driver is used by one
+    coroutine at a time (checkout/checkin), and blocking Selenium calls run on a
+    dedicated executor with one thread per driver. Drivers are recycled after
+    `max_pages` pages or when their browser processes exceed `max_rss_mb`.
+    A restart that fails is retried at the next checkin; once no driver is
+    left at all, checkout raises instead of waiting.
+    """
+
+    def __init__(self, size: int, max_pages: int, max_rss_mb: int):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="webdriver")
+        self._idle: asyncio.Queue | None = None
+        self._warm_up_task: asyncio.Task | None = None
+        self._drivers: set[PooledDriver] = set()
+        self._driver_path = None
+        self._missing = 0   # drivers whose restart is still due
+        self.recycled = 0
+
+    def _create_driver_sync(self) -> PooledDriver:
+        chrome_options = webdriver.ChromeOptions()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument(f"user-agent={CHROME_USER_AGENT}")
+
+        pooled = PooledDriver(webdriver.Chrome(
+            service=ChromeService(self._driver_path),
+            options=chrome_options
+        ))
+        self._drivers.add(pooled)
+        return pooled
+
+    def _quit_sync(self, pooled: PooledDriver):
+        self._drivers.discard(pooled)
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            app_logger.warning(f"Failed to quit WebDriver cleanly: {e}")
+
+    def _rss_mb(self, pooled: PooledDriver) -> float:
+        """Resident memory of the chromedriver process and the browser it started."""
+        try:
+            root = psutil.Process(pooled.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except (psutil.Error, AttributeError):
+            return 0.0
+
+    async def _warm_up(self):
+        loop = asyncio.get_running_loop()
+        self._driver_path = await loop.run_in_executor(self.executor, ChromeDriverManager().install)
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self.executor, self._create_driver_sync) for _ in range(self.size)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                app_logger.error(f"Failed to start a WebDriver: {result}")
+            else:
+                self._idle.put_nowait(result)
+        if self._idle.empty():
+            raise RuntimeError("No WebDriver could be started.")
+        app_logger.info(f"WebDriver pool ready: {self._idle.qsize()}/{self.size} headless drivers.")
+
+    async def start(self):
+        """Starts every driver up front so the first pages do not pay for browser start-up."""
+        if self._warm_up_task is None:
+            self._idle = asyncio.Queue()
+            self._warm_up_task = asyncio.ensure_future(self._warm_up())
+        await self._warm_up_task
+
+    async def checkout(self) -> PooledDriver:
+        await self.start()
+        pooled = await self._idle.get()
+        if pooled is None:
+            # Put back for the next waiter, which has no driver to wait for either
+            self._idle.put_nowait(None)
+            raise RuntimeError("No WebDriver left in the pool: every restart failed.")
+        return pooled
+
+    async def checkin(self, pooled: PooledDriver):
+        pooled.pages += 1
+        reason = None
+        if pooled.pages >= self.max_pages:
+            reason = f"{pooled.pages} pages"
+        elif psutil and self.max_rss_mb:
+            rss = self._rss_mb(pooled)
+            if rss > self.max_rss_mb:
+                reason = f"{rss:.0f} MB RSS"
+
+        if reason:
+            app_logger.info(f"Recycling WebDriver after {reason}.")
+            await asyncio.get_running_loop().run_in_executor(self.executor, self._quit_sync, pooled)
+            self._missing += 1
+        else:
+            self._idle.put_nowait(pooled)
+        if self._missing:
+            await self._restart_missing()
+
+    async def _restart_missing(self):
+        """Starts one of the drivers whose restart is due, including ones that failed before."""
+        self._missing -= 1
+        try:
+            pooled = await asyncio.get_running_loop().run_in_executor(self.executor, self._create_driver_sync)
+        except Exception as e:
+            self._missing += 1
+            if self._drivers:
+                app_logger.error(f"Failed to restart a WebDriver, retrying at the next checkin ({len(self._drivers)} left): {e}")
+            else:
+                app_logger.error(f"Failed to restart a WebDriver and none is left: {e}")
+                self._idle.put_nowait(None)   # wakes the waiting checkouts so they fail
+            return
+        self.recycled += 1
+        self._idle.put_nowait(pooled)
+
+    async def run(self, func, *args):
+        """Runs `func(driver, *args)` on a checked-out driver in the pool's executor."""
+        pooled = await self.checkout()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, pooled.driver, *args)
+        finally:
+            await self.checkin(pooled)
+
+    def close(self):
+        for pooled in list(self._drivers):
+            self._quit_sync(pooled)
+        self.executor.shutdown(wait=False)
+        app_logger.info(f"WebDriver pool closed ({self.recycled} drivers recycled during the run).")
@@ -0,0 +1,182 @@
+# sharding.py : Multi-city crawl split into (source, city, specialty) shards across processes and machines.
+#
+# Workers lease shards from a shared SQLite table (utils/shard_leases.py), crawl
+# them with their own CrawlScheduler and write one CSV per shard. Workers on other
+# machines join by pointing SHARD_DB_PATH and SHARD_OUTPUT_DIR at a shared directory
+# and running `python main.py --shard-worker`. The per-host rate limits are a budget
+# for the whole crawl: local workers split it between them, and a worker on another
+# machine is told its share with --total-workers. The merge step deduplicates all
+# shard files into OUTPUT_FILE_PATH.
+
+import asyncio
+import glob
+import multiprocessing
+import os
+import socket
+
+from scheduler import CrawlJob, CrawlScheduler
+from scrapers.listing_parsers import shutdown_parser_pool
+from scrapers.registry import SCRAPER_CLASSES, build_scraper
+from utils.config import (
+    TARGET_CITIES,
+    SPECIALTIES,
+    OUTPUT_FILE_PATH,
+    OUTPUT_FLUSH_BATCH,
+    SHARD_DB_PATH,
+    SHARD_OUTPUT_DIR,
+    SHARD_LEASE_SECONDS,
+    SHARD_MAX_ATTEMPTS,
+)
+from utils.logger import app_logger
+from utils.rate_limiter import rate_limiter
+from utils.shard_leases import ShardLeaseTable
+from utils.url_sink import CSV_HEADER, UrlSink
+
+
+def open_lease_table() -> ShardLeaseTable:
+    os.makedirs(os.path.dirname(SHARD_DB_PATH) or ".", exist_ok=True)
+    return ShardLeaseTable(SHARD_DB_PATH, SHARD_LEASE_SECONDS, SHARD_MAX_ATTEMPTS)
+
+
+def seed_shards(reset: bool = False) -> int:
+    """Registers one shard per (source, city, specialty); existing shards keep their state."""
+    table = open_lease_table()
+    try:
+        if reset:
+            table.reset()
+            for path in glob.glob(os.path.join(SHARD_OUTPUT_DIR, "*.csv*")):
+                os.remove(path)
+        added = table.seed(
+            (source, city, specialty)
+            for source in SCRAPER_CLASSES
+            for city in TARGET_CITIES
+            for specialty in SPECIALTIES
+        )
+        app_logger.info(f"Shard table {SHARD_DB_PATH}: {added} new shards, status {table.progress()}")
+        return added
+    finally:
+        table.close()
+
+
+def _shard_paths(shard_id: str, owner: str) -> tuple[str, str]:
+    """(final CSV, this owner's partial CSV) of a shard."""
+    final_path = os.path.join(SHARD_OUTPUT_DIR, f"{shard_id}.csv")
+    return final_path, f"{final_path}.{owner}.part"
+
+
+def _discard_part(shard_id: str, owner: str):
+    part_path = _shard_paths(shard_id, owner)[1]
+    if os.path.exists(part_path):
+        os.remove(part_path)
+
+
+async def _keep_lease(table: ShardLeaseTable, shard_id: str, owner: str, crawl: asyncio.Task):
+    """Renews the lease while `crawl` runs; cancels it once the lease is lost."""
+    while True:
+        await asyncio.sleep(SHARD_LEASE_SECONDS / 3)
+        if not table.renew(shard_id, owner):
+            app_logger.warning(f"[{owner}] Lost the lease on shard {shard_id}; another worker will redo it.")
+            crawl.cancel()
+            return
+
+
+async def crawl_shard(table: ShardLeaseTable, shard: dict, owner: str) -> int | None:
+    """
+    Crawls one shard into this owner's partial CSV and returns the number of
+    URLs found, or None if the lease was lost and the crawl abandoned. The
+    caller promotes the partial file only once the table accepts the shard as
+    complete, so a worker that lost its lease never clobbers the file of the
+    worker that took over.
+    """
+    shard_id = shard["shard_id"]
+    part_path = _shard_paths(shard_id, owner)[1]
+
+    scraper = build_scraper(shard["source"], shard["city"])
+    sink = UrlSink(part_path, batch_size=OUTPUT_FLUSH_BATCH)
+    scheduler = CrawlScheduler({(shard["source"], shard["city"]): scraper}, sink)
+    scheduler.submit(CrawlJob(shard["source"], shard["city"], shard["specialty"], 1))
+
+    crawl = asyncio.create_task(scheduler.run())
+    heartbeat = asyncio.create_task(_keep_lease(table, shard_id, owner, crawl))
+    try:
+        await crawl
+    except asyncio.CancelledError:
+        if not heartbeat.done() or heartbeat.cancelled():
+            raise   # cancelled from outside, not by the heartbeat
+        return None
+    finally:
+        heartbeat.cancel()
+        crawl.cancel()
+        sink.close()
+        await scraper.close_session()
+    return len(sink)
+
+
+async def run_shard_worker(owner: str | None = None):
+    """Claims and crawls shards until none are left."""
+    owner = owner or f"{socket.gethostname()}-{os.getpid()}"
+    os.makedirs(SHARD_OUTPUT_DIR, exist_ok=True)
+    table = open_lease_table()
+    done = 0
+    try:
+        while (shard := table.claim(owner)) is not None:
+            shard_id = shard["shard_id"]
+            app_logger.info(f"[{owner}] Claimed shard {shard_id} (attempt {shard['attempt']})")
+            try:
+                urls = await crawl_shard(table, shard, owner)
+            except Exception as e:
+                app_logger.error(f"[{owner}] Shard {shard_id} failed: {e}")
+                table.release(shard_id, owner)
+                _discard_part(shard_id, owner)
+                continue
+            if urls is not None and table.complete(shard_id, owner, urls):
+                final_path, part_path = _shard_paths(shard_id, owner)
+                os.replace(part_path, final_path)
+                done += 1
+                app_logger.success(f"[{owner}] Shard {shard_id} done: {urls} URLs")
+            else:
+                _discard_part(shard_id, owner)
+    finally:
+        table.close()
+        shutdown_parser_pool()
+    app_logger.info(f"[{owner}] No shards left; finished {done}.")
+
+
+def _worker_process(owner: str, workers: int):
+    # Each process has its own rate limiter; together they keep to the configured rates
+    rate_limiter.scale(1 / workers)
+    asyncio.run(run_shard_worker(owner))
+
+
+def run_local_workers(workers: int):
+    """Runs `workers` shard workers as separate processes on this machine."""
+    host = socket.gethostname()
+    processes = [
+        multiprocessing.Process(target=_worker_process, args=(f"{host}-w{i}", workers), name=f"shard-worker-{i}")
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        if process.exitcode:
+            app_logger.error(f"{process.name} exited with code {process.exitcode}")
+
+
+def merge_shard_outputs(output_path: str = OUTPUT_FILE_PATH) -> int:
+    """Deduplicates every finished shard CSV into `output_path`, in a stable order."""
+    table = open_lease_table()
+    progress = table.progress()
+    table.close()
+    unfinished = sum(count for status, count in progress.items() if status != "done")
+    if unfinished:
+        app_logger.warning(f"Merging with {unfinished} shards not done: {progress}")
+
+    sink = UrlSink(output_path, batch_size=OUTPUT_FLUSH_BATCH)
+    shard_files = sorted(glob.glob(os.path.join(SHARD_OUTPUT_DIR, "*.csv")))
+    for path in shard_files:
+        with open(path, "r", encoding="utf-8") as f:
+            sink.add(url for url in (line.strip() for line in f) if url and url != CSV_HEADER)
+    sink.close()
+    app_logger.success(f"Merged {len(shard_files)} shard files into {len(sink)} unique URLs at {output_path}")
+    return len(sink)
@@ -0,0 +1,90 @@
+# utils/frontier.py : Persists the crawl frontier so an interrupted crawl can resume.
+
+import os
+import sqlite3
+
+from utils.logger import app_logger
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+
+class CrawlFrontier:
+    """
+    Status of every listing-page job, keyed by (source, city, specialty, page),
+    mirrored to a SQLite file. Status changes are buffered and written in one
+    transaction per `batch_size` changes, so checkpointing costs a few writes
+    per batch rather than one per page.
+
+    With `resume=True` the statuses of the previous run are loaded; jobs that
+    were not done when it stopped are returned by unfinished().
+    """
+
+    def __init__(self, path: str, batch_size: int, resume: bool = False):
+        self.path = path
+        self.batch_size = batch_size
+        self._status: dict[tuple, str] = {}
+        self._dirty: dict[tuple, str] = {}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                source    TEXT NOT NULL,
+                city      TEXT NOT NULL,
+                specialty TEXT NOT NULL,
+                page      INTEGER NOT NULL,
+                status    TEXT NOT NULL,
+                PRIMARY KEY (source, city, specialty, page)
+            ) WITHOUT ROWID"""
+        )
+        if resume:
+            for *key, status in self.conn.execute("SELECT source, city, specialty, page, status FROM jobs"):
+                self._status[tuple(key)] = status
+            app_logger.info(f"Resuming crawl frontier from {path}: {self.counts()}")
+        else:
+            self.conn.execute("DELETE FROM jobs")
+            self.conn.commit()
+
+    def add(self, key: tuple) -> bool:
+        """Records a new pending job; False if the job is already known."""
+        if key in self._status:
+            return False
+        self.mark(key, PENDING)
+        return True
+
+    def mark(self, key: tuple, status: str):
+        self._status[key] = status
+        self._dirty[key] = status
+
+    def should_flush(self) -> bool:
+        return len(self._dirty) >= self.batch_size
+
+    def flush(self):
+        """Writes the buffered status changes in a single transaction."""
+        if not self._dirty:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO jobs (source, city, specialty, page, status) VALUES (?, ?, ?, ?, ?)",
+                [(*key, status) for key, status in self._dirty.items()],
+            )
+        self._dirty.clear()
+
+    def unfinished(self) -> list[tuple]:
+        """Jobs that were pending, in flight or failed, in page order."""
+        return sorted(key for key, status in self._status.items() if status != DONE)
+
+    def counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for status in self._status.values():
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def close(self):
+        self.flush()
+        self.conn.close()
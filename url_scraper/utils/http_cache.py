@@ -0,0 +1,171 @@
+# utils/http_cache.py : Persistent, size-bounded HTTP response cache with conditional revalidation.
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+
+import httpx
+
+from utils.config import (
+    HTTP_CACHE_ENABLED,
+    HTTP_CACHE_PATH,
+    HTTP_CACHE_MAX_BYTES,
+    HTTP_CACHE_ONLY,
+    HTTP_CACHE_VARY_HEADERS,
+)
+from utils.logger import app_logger
+
+# Response headers worth keeping alongside the body
+STORED_HEADERS = ("content-type", "etag", "last-modified")
+
+
+class ResponseCache:
+    """
+    Stores zlib-compressed response bodies in a SQLite file, keyed by URL plus
+    the request headers that change the response. Entries carry their ETag /
+    Last-Modified so the next run can revalidate with a conditional GET, and the
+    least recently used entries are evicted once the cache exceeds `max_bytes`.
+    """
+
+    def __init__(self, path: str, max_bytes: int, vary_headers: list[str], cache_only: bool = False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.vary_headers = [h.lower() for h in vary_headers]
+        self.cache_only = cache_only
+        self._conn = None
+        self._total_bytes = 0
+
+        # Counters for the run summary
+        self.hits = 0          # served straight from the cache (cache-only mode)
+        self.misses = 0        # no usable entry, full download
+        self.revalidated = 0   # server answered 304 Not Modified
+        self.changed = 0       # entry existed but the server sent a new body
+        self.evicted = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # Sharded crawls share the cache between processes; wait out their writes
+            self._conn = sqlite3.connect(self.path, timeout=30)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+            self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        return self._conn
+
+    def _key(self, url: str, request_headers: dict) -> str:
+        lowered = {name.lower(): value for name, value in request_headers.items()}
+        parts = [url] + [f"{name}:{lowered.get(name, '')}" for name in self.vary_headers]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, url: str, request_headers: dict) -> dict | None:
+        """Returns the cached entry for this request, or None."""
+        key = self._key(url, request_headers)
+        row = self._connect().execute(
+            "SELECT headers, body FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        return {"key": key, "headers": json.loads(row[0]), "body": row[1]}
+
+    def validators(self, entry: dict) -> dict:
+        """Conditional request headers that let the server answer 304."""
+        headers = {}
+        if entry["headers"].get("etag"):
+            headers["If-None-Match"] = entry["headers"]["etag"]
+        if entry["headers"].get("last-modified"):
+            headers["If-Modified-Since"] = entry["headers"]["last-modified"]
+        return headers
+
+    def replay(self, entry: dict | None, url: str) -> httpx.Response | None:
+        """Serves an entry without touching the network (cache-only mode)."""
+        if entry is None:
+            app_logger.warning(f"Cache-only mode: no cached response for {url}")
+            return None
+        self.hits += 1
+        return self._to_response(entry, url)
+
+    def not_modified(self, entry: dict, url: str) -> httpx.Response:
+        """Handles a 304: refreshes the entry's LRU position and serves the cached body."""
+        self.revalidated += 1
+        conn = self._connect()
+        conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), entry["key"]))
+        conn.commit()
+        return self._to_response(entry, url)
+
+    def store(self, url: str, request_headers: dict, response: httpx.Response, had_entry: bool = False):
+        """Saves a fresh 200 response and evicts old entries if over budget."""
+        if had_entry:
+            self.changed += 1
+        key = self._key(url, request_headers)
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        body = zlib.compress(response.content, 6)
+        now = time.time()
+
+        conn = self._connect()
+        old = conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, url, headers, body, size, stored_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, url, json.dumps(headers), body, len(body), now, now),
+        )
+        self._total_bytes += len(body) - (old[0] if old else 0)
+        self._evict()
+        conn.commit()
+
+    def _evict(self):
+        """Drops least recently used entries until the cache fits in max_bytes."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        conn = self._connect()
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            if self._total_bytes <= self.max_bytes:
+                break
+            doomed.append((key,))
+            self._total_bytes -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self.evicted += len(doomed)
+
+    def _to_response(self, entry: dict, url: str) -> httpx.Response:
+        return httpx.Response(
+            status_code=200,
+            headers=entry["headers"],
+            content=zlib.decompress(entry["body"]),
+            request=httpx.Request("GET", url),
+        )
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "changed": self.changed,
+            "evicted": self.evicted,
+            "size_mb": round(self._total_bytes / (1024 * 1024), 2),
+        }
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# Shared by every scraper in the process; None when caching is disabled
+response_cache = (
+    ResponseCache(HTTP_CACHE_PATH, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_VARY_HEADERS, cache_only=HTTP_CACHE_ONLY)
+    if HTTP_CACHE_ENABLED or HTTP_CACHE_ONLY else None
+)
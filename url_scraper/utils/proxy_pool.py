@@ -0,0 +1,109 @@
+# utils/proxy_pool.py : Health-scored proxy rotation with one connection pool per proxy.
+
+import random
+import time
+
+import httpx
+
+from utils.config import (
+    REQUEST_TIMEOUT,
+    PROXY_MAX_CONNECTIONS,
+    PROXY_SCORE_DECAY,
+    PROXY_ERROR_PENALTY,
+    PROXY_INITIAL_LATENCY,
+    PROXY_MAX_CONSECUTIVE_FAILURES,
+    PROXY_MIN_SAMPLES,
+    PROXY_QUARANTINE_ERROR_RATE,
+    PROXY_QUARANTINE_SECONDS,
+)
+from utils.logger import app_logger
+
+
+class ProxyState:
+    """A proxy (or the direct connection), its httpx client and its health scores."""
+
+    def __init__(self, proxy: str | None):
+        self.proxy = proxy
+        self.client = httpx.AsyncClient(
+            proxy=proxy,
+            timeout=REQUEST_TIMEOUT,
+            follow_redirects=True,
+            http2=True,  # Enable HTTP/2 for better performance on modern servers
+            limits=httpx.Limits(max_connections=PROXY_MAX_CONNECTIONS),
+        )
+        # Exponentially decaying averages; recent requests count the most.
+        self.latency = PROXY_INITIAL_LATENCY
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.quarantined_until = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def label(self) -> str:
+        return self.proxy or "direct"
+
+    def score(self) -> float:
+        """Lower is better: expected latency, inflated by the recent error rate."""
+        return self.latency * (1 + PROXY_ERROR_PENALTY * self.error_rate)
+
+
+class ProxyPool:
+    """
+    Routes each request through the healthier of two randomly picked proxies
+    ("power of two choices"), which favours fast, reliable proxies while still
+    spreading load across the pool. Proxies that keep failing are quarantined
+    for PROXY_QUARANTINE_SECONDS.
+    """
+
+    def __init__(self, proxies: list[str]):
+        self.states = [ProxyState(proxy) for proxy in proxies] or [ProxyState(None)]
+
+    def choose(self) -> ProxyState:
+        now = time.monotonic()
+        healthy = [state for state in self.states if state.quarantined_until <= now]
+        if not healthy:
+            # Everything is cooling down; use whichever comes back first.
+            return min(self.states, key=lambda state: state.quarantined_until)
+        if len(healthy) == 1:
+            return healthy[0]
+        first, second = random.sample(healthy, 2)
+        return first if first.score() <= second.score() else second
+
+    def report(self, state: ProxyState, latency: float, ok: bool):
+        """Feeds the outcome of one request back into the proxy's scores."""
+        state.requests += 1
+        state.latency += PROXY_SCORE_DECAY * (latency - state.latency)
+        state.error_rate += PROXY_SCORE_DECAY * ((0.0 if ok else 1.0) - state.error_rate)
+
+        if ok:
+            state.consecutive_failures = 0
+            return
+
+        state.failures += 1
+        state.consecutive_failures += 1
+        too_many_in_a_row = state.consecutive_failures >= PROXY_MAX_CONSECUTIVE_FAILURES
+        too_unreliable = state.requests >= PROXY_MIN_SAMPLES and state.error_rate >= PROXY_QUARANTINE_ERROR_RATE
+        if len(self.states) > 1 and (too_many_in_a_row or too_unreliable):
+            state.quarantined_until = time.monotonic() + PROXY_QUARANTINE_SECONDS
+            app_logger.warning(f"Quarantining proxy {state.label} for {PROXY_QUARANTINE_SECONDS}s (error rate {state.error_rate:.2f}, {state.consecutive_failures} failures in a row)")
+            # Give it a fair trial once the cool-down is over
+            state.consecutive_failures = 0
+            state.error_rate /= 2
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "proxy": state.label,
+                "requests": state.requests,
+                "failures": state.failures,
+                "latency_seconds": round(state.latency, 3),
+                "error_rate": round(state.error_rate, 3),
+                "quarantined": state.quarantined_until > time.monotonic(),
+            }
+            for state in self.states
+        ]
+
+    async def aclose(self):
+        for state in self.states:
+            await state.client.aclose()
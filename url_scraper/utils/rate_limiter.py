@@ -0,0 +1,100 @@
+# utils/rate_limiter.py : Process-wide token-bucket rate limiting, shared by every request to the same host.
+
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+from utils.config import DEFAULT_HOST_RATE, DEFAULT_HOST_BURST, HOST_RATE_LIMITS
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `burst` tokens and refills at `rate`
+    tokens per second. Each request consumes one token, so an idle host is hit
+    immediately while a busy one is held to the configured rate.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+        # Counters
+        self.tokens_granted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """Waits for a token and returns the time spent waiting, in seconds."""
+        start = time.monotonic()
+        # The lock makes waiters queue up in arrival order instead of racing for tokens.
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+        waited = time.monotonic() - start
+        self.tokens_granted += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def stats(self) -> dict:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens_granted": self.tokens_granted,
+            "total_wait_seconds": round(self.total_wait, 3),
+            "avg_wait_seconds": round(self.total_wait / self.tokens_granted, 3) if self.tokens_granted else 0.0,
+            "max_wait_seconds": round(self.max_wait, 3),
+        }
+
+
+class HostRateLimiter:
+    """Hands out one TokenBucket per host, using HOST_RATE_LIMITS or the defaults."""
+
+    def __init__(self, limits: dict, default_rate: float, default_burst: int):
+        self.limits = limits
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.buckets: dict[str, TokenBucket] = {}
+
+    def bucket_for(self, host: str) -> TokenBucket:
+        if host not in self.buckets:
+            limit = self.limits.get(host, {})
+            self.buckets[host] = TokenBucket(
+                rate=limit.get("rate", self.default_rate),
+                burst=limit.get("burst", self.default_burst),
+            )
+        return self.buckets[host]
+
+    def scale(self, factor: float):
+        """Scales every rate, e.g. to split the limits between worker processes."""
+        self.default_rate *= factor
+        self.limits = {
+            host: {**limit, "rate": limit["rate"] * factor} if "rate" in limit else limit
+            for host, limit in self.limits.items()
+        }
+        for bucket in self.buckets.values():
+            bucket.rate *= factor
+
+    async def acquire(self, url: str) -> float:
+        """Waits until a request to the host of `url` is allowed."""
+        return await self.bucket_for(urlsplit(url).netloc).acquire()
+
+    def stats(self) -> dict:
+        """Per-host counters for wait time and tokens granted."""
+        return {host: bucket.stats() for host, bucket in self.buckets.items()}
+
+
+# Shared by every scraper in the process
+rate_limiter = HostRateLimiter(HOST_RATE_LIMITS, DEFAULT_HOST_RATE, DEFAULT_HOST_BURST)
@@ -0,0 +1,114 @@
+# utils/shard_leases.py : SQLite lease table that hands crawl shards out to worker processes.
+
+import sqlite3
+import time
+
+from utils.logger import app_logger
+
+
+class ShardLeaseTable:
+    """
+    One row per (source, city, specialty) shard. A worker claims a shard by
+    taking a time-limited lease on it and must renew the lease while it works;
+    if the worker dies, the lease runs out and the shard goes to the next
+    worker that asks. Every claim runs in its own write transaction, so any
+    number of processes (or machines sharing the file) can use the table.
+    """
+
+    def __init__(self, path: str, lease_seconds: float, max_attempts: int):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA busy_timeout = 60000")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS shards (
+                shard_id      TEXT PRIMARY KEY,
+                source        TEXT NOT NULL,
+                city          TEXT NOT NULL,
+                specialty     TEXT NOT NULL,
+                status        TEXT NOT NULL DEFAULT 'pending',
+                owner         TEXT,
+                lease_expires REAL NOT NULL DEFAULT 0,
+                attempts      INTEGER NOT NULL DEFAULT 0,
+                urls          INTEGER NOT NULL DEFAULT 0
+            )"""
+        )
+
+    @staticmethod
+    def shard_id(source: str, city: str, specialty: str) -> str:
+        return f"{source}_{city}_{specialty}"
+
+    def seed(self, shards) -> int:
+        """Adds (source, city, specialty) shards that are not in the table yet."""
+        cursor = self.conn.executemany(
+            "INSERT OR IGNORE INTO shards (shard_id, source, city, specialty) VALUES (?, ?, ?, ?)",
+            [(self.shard_id(*shard), *shard) for shard in shards],
+        )
+        return cursor.rowcount
+
+    def reset(self):
+        self.conn.execute("DELETE FROM shards")
+
+    def claim(self, owner: str) -> dict | None:
+        """Leases the next pending (or abandoned) shard to `owner`."""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                """SELECT shard_id, source, city, specialty, attempts FROM shards
+                   WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)
+                   ORDER BY attempts, shard_id LIMIT 1""",
+                (now,),
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            shard_id, source, city, specialty, attempts = row
+            if attempts >= self.max_attempts:
+                # Its last lease expired: the worker died mid-shard one time too many.
+                self.conn.execute("UPDATE shards SET status = 'failed', owner = NULL WHERE shard_id = ?", (shard_id,))
+                self.conn.execute("COMMIT")
+                app_logger.error(f"Shard {shard_id} abandoned after {attempts} attempts.")
+                return self.claim(owner)
+            self.conn.execute(
+                """UPDATE shards SET status = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1
+                   WHERE shard_id = ?""",
+                (owner, now + self.lease_seconds, shard_id),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return {"shard_id": shard_id, "source": source, "city": city, "specialty": specialty, "attempt": attempts + 1}
+
+    def renew(self, shard_id: str, owner: str) -> bool:
+        """Extends the lease; False means the shard was handed to someone else."""
+        cursor = self.conn.execute(
+            "UPDATE shards SET lease_expires = ? WHERE shard_id = ? AND owner = ? AND status = 'leased'",
+            (time.time() + self.lease_seconds, shard_id, owner),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, shard_id: str, owner: str, urls: int) -> bool:
+        cursor = self.conn.execute(
+            "UPDATE shards SET status = 'done', urls = ? WHERE shard_id = ? AND owner = ? AND status = 'leased'",
+            (urls, shard_id, owner),
+        )
+        return cursor.rowcount == 1
+
+    def release(self, shard_id: str, owner: str):
+        """Gives a shard back after a failed attempt, or marks it failed for good."""
+        self.conn.execute(
+            """UPDATE shards SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                                 owner = NULL, lease_expires = 0
+               WHERE shard_id = ? AND owner = ?""",
+            (self.max_attempts, shard_id, owner),
+        )
+
+    def progress(self) -> dict[str, int]:
+        """Number of shards per status."""
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM shards GROUP BY status").fetchall())
+
+    def close(self):
+        self.conn.close()
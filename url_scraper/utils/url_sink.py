@@ -0,0 +1,116 @@
+# utils/url_sink.py : Streams discovered URLs to disk as they are found, deduplicated on the fly.
+
+import hashlib
+import os
+
+from utils.logger import app_logger
+
+CSV_HEADER = "url"
+
+
+def _digest(url: str) -> int:
+    """64-bit fingerprint of a URL; far smaller in memory than the URL string itself."""
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _repair_tail(path: str):
+    """Cuts a torn last line off the CSV at `path`; an empty file gets its header back."""
+    with open(path, "rb+") as f:
+        data_end = f.seek(0, os.SEEK_END)
+        if data_end:
+            # A crash mid-write can leave a partial last line; cut it off.
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                tail_start = max(0, data_end - 65536)
+                f.seek(tail_start)
+                f.truncate(tail_start + f.read().rfind(b"\n") + 1)
+        if f.seek(0, os.SEEK_END) == 0:
+            f.write((CSV_HEADER + "\n").encode("utf-8"))
+
+
+class UrlSink:
+    """
+    Append-only CSV of unique URLs. New URLs are buffered and written in
+    batches, each batch flushed and fsync'ed, so a crash loses at most one batch.
+    Only 64-bit fingerprints are kept in memory for deduplication.
+
+    With `resume=True` an existing file is read back (dropping a torn last line)
+    and extended; otherwise it is started afresh. When `delta_path` is given,
+    URLs that were not in the file at start-up are also written there; on
+    resume an existing delta file is extended the same way.
+    """
+
+    def __init__(self, path: str, batch_size: int, resume: bool = False, delta_path: str | None = None):
+        self.path = path
+        self.batch_size = batch_size
+        self.delta_path = delta_path
+        self._seen: set[int] = set()
+        self._buffer: list[str] = []
+        self.loaded = 0   # URLs already on disk at start-up
+        self.added = 0    # URLs written by this run
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if resume and os.path.exists(path):
+            self._load_existing()
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(CSV_HEADER + "\n")
+        self._file = open(path, "a", encoding="utf-8")
+
+        self._delta_file = None
+        if delta_path:
+            os.makedirs(os.path.dirname(delta_path) or ".", exist_ok=True)
+            if resume and os.path.exists(delta_path):
+                _repair_tail(delta_path)
+            else:
+                with open(delta_path, "w", encoding="utf-8") as f:
+                    f.write(CSV_HEADER + "\n")
+            self._delta_file = open(delta_path, "a", encoding="utf-8")
+
+    def _load_existing(self):
+        _repair_tail(self.path)
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                url = line.strip()
+                if url and url != CSV_HEADER:
+                    self._seen.add(_digest(url))
+        self.loaded = len(self._seen)
+        app_logger.info(f"Resuming output: {self.loaded} URLs already in {self.path}")
+
+    def __contains__(self, url: str) -> bool:
+        return _digest(url) in self._seen
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add(self, urls) -> int:
+        """Records the URLs not seen before and returns how many there were."""
+        new = 0
+        for url in urls:
+            digest = _digest(url)
+            if digest in self._seen:
+                continue
+            self._seen.add(digest)
+            self._buffer.append(url)
+            new += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+        return new
+
+    def flush(self):
+        """Writes the buffered URLs and forces them to disk."""
+        if not self._buffer:
+            return
+        lines = "".join(url + "\n" for url in self._buffer)
+        for f in filter(None, (self._file, self._delta_file)):
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self.added += len(self._buffer)
+        self._buffer.clear()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+        if self._delta_file:
+            self._delta_file.close()